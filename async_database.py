@@ -0,0 +1,134 @@
+"""
+Async Database Facade
+Runs Database calls on a small worker pool so the Tk event loop never waits on MySQL.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class AsyncDatabase:
+    """Submits Database work to background threads and delivers results on the Tk main thread"""
+
+    def __init__(self, db, dispatcher, max_workers=4):
+        """
+        Start the worker pool
+
+        Args:
+            db: Database instance (its connection pool should have at least max_workers connections)
+            dispatcher: MainThreadDispatcher used to deliver results to Tk
+            max_workers: Number of queries that can run at once
+        """
+        self.db = db
+        self.dispatcher = dispatcher
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self.lock = threading.Lock()
+        self.generations = {}  # key -> generation of the newest submission
+
+    def submit(self, fn, *args, callback=None, errback=None, owner=None, key=None):
+        """
+        Run fn(*args) on a worker thread
+
+        Calls that must happen in order (e.g. a write and the reload that shows it)
+        belong in one function, or the second should be submitted from the first's callback.
+
+        Args:
+            fn: Database method, or any function that uses the database
+            callback: Called on the Tk main thread with the result
+            errback: Called on the Tk main thread with the exception, if any
+            owner: Widget the callbacks update; they are skipped if it has been destroyed
+            key: Only the newest submission with the same key delivers its result,
+                so a slow, outdated reload can't overwrite a newer one
+
+        Returns:
+            concurrent.futures.Future for the result
+        """
+        generation = self._next_generation(key)
+        return self._run(fn, args, callback, errback, owner, key, generation)
+
+    def stream(self, iterate, *args, on_batch, on_done=None, errback=None, owner=None, key=None):
+        """
+        Consume a batch generator (e.g. Database.iter_user_books) on a worker thread,
+        handing each batch to the Tk main thread as soon as it is read
+
+        Args:
+            iterate: Generator function yielding lists of rows
+            on_batch: Called on the Tk main thread with every batch
+            on_done: Called on the Tk main thread with the total row count
+            errback, owner, key: As for submit(); a superseded stream stops reading
+
+        Returns:
+            concurrent.futures.Future for the total row count
+        """
+        generation = self._next_generation(key)
+
+        def consume():
+            count = 0
+            batches = iterate(*args)
+            try:
+                for batch in batches:
+                    if key is not None and self.generations.get(key) != generation:
+                        break  # A newer load replaced this one
+                    count += len(batch)
+                    self.dispatcher.post(self._deliver, on_batch, batch, owner, key, generation)
+            finally:
+                batches.close()
+            return count
+
+        return self._run(consume, (), on_done, errback, owner, key, generation)
+
+    def __getattr__(self, name):
+        """
+        Async version of a Database method, e.g.
+        async_db.get_user_books(user_id, status, callback=show_books)
+        """
+        method = getattr(self.db, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            return self.submit(method, *args, **kwargs)
+
+        return call
+
+    def _next_generation(self, key):
+        """Register a new submission for key and return its generation (None without a key)"""
+        if key is None:
+            return None
+        with self.lock:
+            generation = self.generations.get(key, 0) + 1
+            self.generations[key] = generation
+            return generation
+
+    def _run(self, fn, args, callback, errback, owner, key, generation):
+        """Queue fn(*args) and route its outcome through _finished()"""
+        future = self.executor.submit(fn, *args)
+        future.add_done_callback(
+            lambda f: self._finished(f, callback, errback, owner, key, generation)
+        )
+        return future
+
+    def shutdown(self, wait=True):
+        """Stop accepting work; by default wait for queued writes to finish"""
+        self.executor.shutdown(wait=wait)
+
+    def _finished(self, future, callback, errback, owner, key, generation):
+        """Forward a call's outcome to the main thread (runs on the worker)"""
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            if errback:
+                self.dispatcher.post(self._deliver, errback, error, owner, key, generation)
+            else:
+                print(f"Error in database task: {error}")
+        elif callback:
+            self.dispatcher.post(self._deliver, callback, future.result(), owner, key, generation)
+
+    def _deliver(self, handler, value, owner, key, generation):
+        """Run a callback on the main thread unless it is outdated or its widget is gone"""
+        if key is not None and self.generations.get(key) != generation:
+            return
+        if owner is not None and not owner.winfo_exists():
+            return
+        handler(value)
@@ -0,0 +1,153 @@
+"""
+Async Google Books API Handler
+asyncio/aiohttp client for fanning out many Google Books requests at once,
+e.g. refreshing metadata for a whole library. Requests share the blocking
+client's token bucket and circuit breaker, so both stay within one quota.
+"""
+
+import asyncio
+import aiohttp
+from google_books_api import GoogleBooksAPI, CircuitOpenError, json_loads
+from rate_limiter import TokenBucket, CircuitBreaker, backoff_delay
+
+class AsyncGoogleBooksAPI:
+    """Concurrent Google Books client; run it on the AsyncLoopThread from the GUI"""
+
+    BASE_URL = GoogleBooksAPI.BASE_URL
+    FIELD_PROFILES = GoogleBooksAPI.FIELD_PROFILES
+    RETRYABLE_STATUSES = GoogleBooksAPI.RETRYABLE_STATUSES
+
+    # Same URLs and parsing as the blocking client
+    build_search_url = GoogleBooksAPI.build_search_url
+    build_volume_url = GoogleBooksAPI.build_volume_url
+    parse_book_data = staticmethod(GoogleBooksAPI.parse_book_data)
+    parse_search_response = staticmethod(GoogleBooksAPI.parse_search_response)
+
+    def __init__(self, concurrency=8, connection_limit=16, timeout=10, base_url=None,
+                 rate_limiter=None, circuit_breaker=None, max_backoff_attempts=4):
+        """
+        Create the client (the HTTP session is opened on first use, inside the loop)
+
+        Args:
+            concurrency: Maximum number of requests in flight at once
+            connection_limit: Maximum number of pooled keep-alive connections
+            timeout: Total timeout per request in seconds
+            base_url: Volumes endpoint to use instead of BASE_URL
+            rate_limiter: TokenBucket (pass GoogleBooksAPI.rate_limiter to share its quota)
+            circuit_breaker: CircuitBreaker (pass GoogleBooksAPI.circuit_breaker to share it)
+            max_backoff_attempts: Retries of a throttled (429/5xx) request before giving up
+        """
+        if base_url:
+            self.BASE_URL = base_url.rstrip('/')
+        self.rate_limiter = rate_limiter or TokenBucket()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.max_backoff_attempts = max_backoff_attempts
+        self.concurrency = concurrency
+        self.connection_limit = connection_limit
+        self.timeout = timeout
+        self.semaphore = None
+        self.session = None
+
+    async def search_books(self, query, max_results=20, start_index=0, profile='list'):
+        """
+        Search for books
+
+        Args:
+            query: Search query string
+            max_results: Maximum number of results (one page, at most 40)
+            start_index: Position of the first result
+            profile: Key of FIELD_PROFILES selecting which fields to download
+
+        Returns:
+            List of Book records
+        """
+        try:
+            data = await self._get_json(self.build_search_url(query, max_results, start_index, profile))
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, CircuitOpenError) as e:
+            print(f"Error searching books: {e}")
+            return []
+
+        return self.parse_search_response(data)
+
+    async def get_book_by_id(self, google_books_id, profile='detail'):
+        """
+        Get information for a specific book by its Google Books ID
+
+        Returns:
+            Book record or None
+        """
+        try:
+            data = await self._get_json(self.build_volume_url(google_books_id, profile))
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, CircuitOpenError) as e:
+            print(f"Error getting book details: {e}")
+            return None
+        return self.parse_book_data(data)
+
+    async def search_many(self, queries, max_results=20):
+        """
+        Run several searches concurrently
+
+        Returns:
+            Dictionary mapping each query to its list of books
+        """
+        results = await asyncio.gather(*(self.search_books(q, max_results) for q in queries))
+        return dict(zip(queries, results))
+
+    async def get_books_by_ids(self, google_books_ids):
+        """
+        Look up many volumes concurrently (bounded by the semaphore)
+
+        Returns:
+            Dictionary mapping each Google Books ID to its book (None if the lookup failed)
+        """
+        results = await asyncio.gather(*(self.get_book_by_id(gid) for gid in google_books_ids))
+        return dict(zip(google_books_ids, results))
+
+    async def close(self):
+        """Close the HTTP session"""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def _get_json(self, url):
+        """
+        GET a URL under the concurrency limit and decode its JSON body
+
+        Paced, retried and guarded like GoogleBooksAPI._get_json, without
+        blocking the event loop while waiting.
+        """
+        if self.session is None:
+            # Created lazily so they belong to the loop that runs the requests
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+        for attempt in range(self.max_backoff_attempts + 1):
+            if not self.circuit_breaker.allow_request():
+                raise CircuitOpenError("Google Books API is temporarily unavailable")
+
+            await self.rate_limiter.acquire_async()
+
+            try:
+                async with self.semaphore:
+                    async with self.session.get(url) as response:
+                        if response.status not in self.RETRYABLE_STATUSES:
+                            # Any other answer (a 404 included) shows the API is up
+                            self.circuit_breaker.record_success()
+                            response.raise_for_status()
+                            return json_loads(await response.read())
+
+                        if self.circuit_breaker.record_throttled():
+                            response.raise_for_status()  # A throttled half-open trial reopens the circuit
+                        if attempt == self.max_backoff_attempts:
+                            self.circuit_breaker.record_failure()
+                            response.raise_for_status()
+                        delay = GoogleBooksAPI._retry_after(response) or backoff_delay(attempt)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.circuit_breaker.record_failure()
+                raise
+
+            # Sleep outside the semaphore so other requests can use the slot
+            await asyncio.sleep(delay)
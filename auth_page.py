@@ -183,16 +183,16 @@ class AuthPage(tk.Frame):
             messagebox.showerror("Error", "Please enter a valid email address", parent=dialog)
             return
         
-        # Verify username and email match in database
-        try:
-            cursor = self.app.db.connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT user_id FROM users WHERE username = %s AND email = %s",
-                (username, email)
-            )
-            user = cursor.fetchone()
-            cursor.close()
-            
+        # Verify username and email match in database (in the background)
+        def find_user():
+            with self.app.db.cursor(dictionary=True) as cursor:
+                cursor.execute(
+                    "SELECT user_id FROM users WHERE username = %s AND email = %s",
+                    (username, email)
+                )
+                return cursor.fetchone()
+                
+        def found(user):
             if not user:
                 messagebox.showerror(
                     "Error",
@@ -207,8 +207,12 @@ class AuthPage(tk.Frame):
             # Open new password dialog
             self.create_new_password_dialog(user['user_id'], username)
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Database error: {e}", parent=dialog)
+        self.app.async_db.submit(
+            find_user,
+            callback=found,
+            errback=lambda e: messagebox.showerror("Error", f"Database error: {e}", parent=dialog),
+            owner=dialog
+        )
 
     def create_new_password_dialog(self, user_id, username):
         """Dialog to create new password"""
@@ -404,25 +408,28 @@ class AuthPage(tk.Frame):
             messagebox.showerror("Error", "Passwords do not match", parent=dialog)
             return
         
-        # Update password in database
-        try:
-            cursor = self.app.db.connection.cursor()
+        # Update password in database (in the background)
+        def update_password():
             password_hash = self.app.db.hash_password(new_password)
-            cursor.execute(
-                "UPDATE users SET password_hash = %s WHERE user_id = %s",
-                (password_hash, user_id)
-            )
-            self.app.db.connection.commit()
-            cursor.close()
-            
+            with self.app.db.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE users SET password_hash = %s WHERE user_id = %s",
+                    (password_hash, user_id)
+                )
+                
+        def updated(result):
             dialog.destroy()
             messagebox.showinfo(
                 "Success",
                 "Password has been reset successfully!\nYou can now login with your new password."
             )
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to update password: {e}", parent=dialog)
+        self.app.async_db.submit(
+            update_password,
+            callback=updated,
+            errback=lambda e: messagebox.showerror("Error", f"Failed to update password: {e}", parent=dialog),
+            owner=dialog
+        )
         
     def create_widgets(self):
         """Create the authentication page UI with rounded corners"""
@@ -826,11 +833,14 @@ class AuthPage(tk.Frame):
             
         if self.showing_login:
             # Handle login
-            success, user_id, message = self.app.db.login_user(username, password)
-            if success:
-                self.app.show_main_dashboard(user_id)
-            else:
-                messagebox.showerror("Login Failed", message)
+            def logged_in(result):
+                success, user_id, message = result
+                if success:
+                    self.app.show_main_dashboard(user_id)
+                else:
+                    messagebox.showerror("Login Failed", message)
+                    
+            self.app.async_db.login_user(username, password, callback=logged_in, owner=self)
         else:
             # Handle registration
             email = self.email_entry.get().strip()
@@ -845,9 +855,14 @@ class AuthPage(tk.Frame):
                 messagebox.showerror("Error", "Passwords do not match")
                 return
                 
-            success, message = self.app.db.register_user(username, password, email)
-            if success:
-                messagebox.showinfo("Success", "Account created successfully! Please login.")
-                self.toggle_form()
-            else:
-                messagebox.showerror("Registration Failed", message)
\ No newline at end of file
+            def registered(result):
+                success, message = result
+                if success:
+                    messagebox.showinfo("Success", "Account created successfully! Please login.")
+                    self.toggle_form()
+                else:
+                    messagebox.showerror("Registration Failed", message)
+                    
+            self.app.async_db.register_user(
+                username, password, email, callback=registered, owner=self
+            )
\ No newline at end of file
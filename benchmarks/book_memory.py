@@ -0,0 +1,67 @@
+"""
+Book Record Memory Benchmark
+Measures the memory of 10,000 books held as plain dictionaries (the old
+representation) versus Book records with __slots__.
+
+Usage: python benchmarks/book_memory.py --count 10000
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from book import Book
+
+
+def sample_values(i):
+    """Field values of a typical shelf row (strings are shared by both representations)"""
+    return {
+        'google_books_id': f"zyTCAlFPjgYC{i}",
+        'title': f"Book title number {i}",
+        'authors': "First Author, Second Author",
+        'description': None,
+        'cover_url': f"https://books.google.com/books/content?id={i}&printsec=frontcover&img=1&zoom=2",
+        'page_count': 320,
+        'published_date': "2004-05-01",
+        'categories': "Fiction",
+        'preview_link': '',
+        'info_link': '',
+        'book_id': i,
+        'user_book_id': i,
+        'current_page': 12,
+        'date_added': None,
+        'date_finished': None
+    }
+
+
+def measure(build, rows):
+    """Bytes allocated while building one container object per row"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [build(row) for row in rows]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args()
+
+    rows = [sample_values(i) for i in range(args.count)]
+
+    as_dicts = measure(dict, rows)
+    as_books = measure(Book.from_dict, rows)
+
+    print(f"Books:        {args.count}")
+    print(f"dict:         {as_dicts / 1024:.0f} KiB ({as_dicts / args.count:.0f} bytes/book)")
+    print(f"Book/slots:   {as_books / 1024:.0f} KiB ({as_books / args.count:.0f} bytes/book)")
+    print(f"Reduction:    {100 * (as_dicts - as_books) / as_dicts:.0f}%")
+
+if __name__ == "__main__":
+    main()
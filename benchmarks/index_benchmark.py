@@ -0,0 +1,162 @@
+"""
+Index Benchmark
+Fills a scratch MySQL database with a large library, then compares query plans
+and latencies of the google_books_id lookup and the get_user_books shelf query with and
+without the indexes added by the schema migrations.
+
+Usage: python benchmarks/index_benchmark.py --rows 1000000 --users 2000 --password secret
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database, MIGRATIONS, SHELF_QUERY
+
+STATUSES = ('currently_reading', 'finished', 'favourite')
+
+# Point lookup on google_books_id: how imports match stored books (get_book_ids),
+# and the unique-key probe behind the add_book/shelve_book upsert
+LOOKUP_QUERY = "SELECT book_id FROM books WHERE google_books_id = %s"
+
+INDEXES = (
+    ('books', 'idx_books_google_books_id'),
+    ('user_books', 'idx_user_books_shelf'),
+)
+
+
+def seed(db, rows, users, batch_size=5000):
+    """Insert users, rows books and rows shelf entries (skipped if already seeded)"""
+    with db.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM user_books")
+        if cursor.fetchone()[0] >= rows:
+            return
+
+    start = time.perf_counter()
+    with db.cursor() as cursor:
+        cursor.executemany(
+            "INSERT IGNORE INTO users (username, password_hash) VALUES (%s, %s)",
+            [(f"bench_user_{i}", db.hash_password(str(i))) for i in range(users)]
+        )
+        cursor.execute("SELECT user_id FROM users WHERE username LIKE 'bench_user_%'")
+        user_ids = [row[0] for row in cursor.fetchall()]
+
+    for offset in range(0, rows, batch_size):
+        count = min(batch_size, rows - offset)
+        with db.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO books (google_books_id, title, authors, cover_url, page_count) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                [(f"bench{i:09d}", f"Book {i}", "Some Author", "", 300)
+                 for i in range(offset, offset + count)]
+            )
+            first_id = cursor.lastrowid  # First id of a multi-row insert
+
+        # One shelf entry per book keeps (user_id, book_id, status) unique
+        base = datetime(2015, 1, 1)
+        with db.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO user_books (user_id, book_id, status, current_page, date_added) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                [(random.choice(user_ids), first_id + i, random.choice(STATUSES), 0,
+                  base + timedelta(minutes=random.randrange(5_000_000)))
+                 for i in range(count)]
+            )
+        print(f"\rSeeded {offset + count:,}/{rows:,} rows", end='', flush=True)
+
+    print(f"\rSeeded {rows:,} books and shelf entries in {time.perf_counter() - start:.1f}s")
+
+
+def explain(db, query, params):
+    """EXPLAIN rows as (table, access type, key, estimated rows, extra)"""
+    with db.cursor(dictionary=True) as cursor:
+        cursor.execute("EXPLAIN " + query, params)
+        return [(row['table'], row['type'], row['key'], row['rows'], row['Extra'])
+                for row in cursor.fetchall()]
+
+
+def time_query(db, query, param_sets):
+    """Latencies in milliseconds of running the query once per parameter set"""
+    latencies = []
+    with db.cursor() as cursor:
+        for params in param_sets:
+            start = time.perf_counter()
+            cursor.execute(query, params)
+            cursor.fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(db, label, samples, rows):
+    """Print plans and latency percentiles of both hot queries"""
+    with db.cursor() as cursor:
+        cursor.execute("SELECT user_id FROM users WHERE username LIKE 'bench_user_%'")
+        user_ids = [row[0] for row in cursor.fetchall()]
+
+    lookups = [(f"bench{random.randrange(rows):09d}",) for _ in range(samples)]
+    shelves = [(random.choice(user_ids), random.choice(STATUSES)) for _ in range(samples)]
+
+    print(f"\n== {label} ==")
+    for name, query, param_sets in (("google_books_id lookup", LOOKUP_QUERY, lookups),
+                                    ("get_user_books", SHELF_QUERY, shelves)):
+        print(f"{name}:")
+        for table, access, key, estimate, extra in explain(db, query, param_sets[0]):
+            print(f"  plan  {table:<4} type={access:<6} key={key or '-':<26} rows={estimate!s:<8} {extra or ''}")
+        latencies = sorted(time_query(db, query, param_sets))
+        print(f"  p50 {statistics.median(latencies):8.2f} ms   "
+              f"p95 {latencies[int(len(latencies) * 0.95) - 1]:8.2f} ms   "
+              f"max {latencies[-1]:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Books and shelf entries to create")
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--samples', type=int, default=200, help="Timed runs per query")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', default='book_tracker_bench')
+    parser.add_argument('--keep', action='store_true', help="Keep the scratch database")
+    args = parser.parse_args()
+
+    db = Database(pool_size=2, host=args.host, user=args.user,
+                  password=args.password, database=args.database)
+    if db.pool is None:
+        sys.exit("Could not connect to MySQL")
+
+    try:
+        seed(db, args.rows, args.users)
+
+        # Back to the pre-migration schema
+        with db.cursor() as cursor:
+            for table, index in INDEXES:
+                cursor.execute(f"ALTER TABLE {table} DROP INDEX {index}")
+            cursor.execute("DELETE FROM schema_migrations")
+            cursor.execute("ANALYZE TABLE books, user_books")
+            cursor.fetchall()
+        report(db, "without indexes", args.samples, args.rows)
+
+        start = time.perf_counter()
+        applied = db.apply_migrations()
+        print(f"\nApplied {len(applied)}/{len(MIGRATIONS)} migrations in "
+              f"{time.perf_counter() - start:.1f}s")
+        with db.cursor() as cursor:
+            cursor.execute("ANALYZE TABLE books, user_books")
+            cursor.fetchall()
+        report(db, "with indexes", args.samples, args.rows)
+    finally:
+        if not args.keep:
+            with db.cursor() as cursor:
+                cursor.execute(f"DROP DATABASE `{args.database}`")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Search Response Parsing Benchmark
+Compares the original decode + parse path (stdlib json, per-item .get chains)
+with the current one (fast JSON decoder if installed, lean parse) on recorded
+search responses.
+
+Usage: python benchmarks/parse_benchmark.py fixtures --repeat 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import google_books_api
+from books_api_standin import FixtureStore
+from google_books_api import GoogleBooksAPI
+
+
+def reference_parse(item):
+    """The original GoogleBooksAPI.parse_book_data, kept here as the baseline"""
+    volume_info = item.get('volumeInfo', {})
+    authors = volume_info.get('authors', [])
+    authors_str = ', '.join(authors) if authors else 'Unknown Author'
+    categories = volume_info.get('categories', [])
+    categories_str = ', '.join(categories) if categories else ''
+    image_links = volume_info.get('imageLinks', {})
+    cover_url = image_links.get('thumbnail', '')
+    if cover_url:
+        cover_url = cover_url.replace('zoom=1', 'zoom=2')
+        cover_url = cover_url.replace('http://', 'https://')
+    return {
+        'google_books_id': item.get('id', ''),
+        'title': volume_info.get('title', 'Unknown Title'),
+        'authors': authors_str,
+        'description': volume_info.get('description', 'No description available'),
+        'cover_url': cover_url,
+        'page_count': volume_info.get('pageCount', 0),
+        'published_date': volume_info.get('publishedDate', ''),
+        'categories': categories_str,
+        'preview_link': volume_info.get('previewLink', ''),
+        'info_link': volume_info.get('infoLink', '')
+    }
+
+
+def baseline(bodies):
+    for body in bodies:
+        data = json.loads(body)
+        books = []
+        for item in data.get('items', []):
+            book = reference_parse(item)
+            if book:
+                books.append(book)
+
+
+def optimized(bodies):
+    for body in bodies:
+        GoogleBooksAPI.parse_search_response(google_books_api.json_loads(body))
+
+
+def best_of(function, bodies, repeat, rounds=5):
+    """Best wall time of `rounds` runs of `repeat` passes over all bodies"""
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function(bodies)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', help="Fixture directory written by books_api_standin.py record")
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    bodies = [
+        fixture['body'].encode('utf-8')
+        for fixture in FixtureStore(args.directory)
+        if fixture['status'] == 200 and fixture['request'].startswith('?')
+    ]
+    if not bodies:
+        sys.exit(f"No recorded search responses in {args.directory}")
+
+    # Same output, or the comparison means nothing
+    for body in bodies:
+        data = json.loads(body)
+        parsed = [book.to_dict() for book in GoogleBooksAPI.parse_search_response(data)]
+        expected = [reference_parse(i) for i in data.get('items', [])]
+        assert [{k: book[k] for k in ref} for book, ref in zip(parsed, expected)] == expected
+
+    responses = len(bodies) * args.repeat
+    total_bytes = sum(len(b) for b in bodies) * args.repeat
+    decoder = google_books_api.json_loads.__module__ or 'json'
+
+    before = best_of(baseline, bodies, args.repeat)
+    after = best_of(optimized, bodies, args.repeat)
+
+    print(f"Responses: {responses} ({total_bytes / 1e6:.1f} MB), decoder: {decoder}")
+    print(f"Baseline:  {before * 1e6 / responses:.1f} us/response")
+    print(f"Optimized: {after * 1e6 / responses:.1f} us/response")
+    print(f"Speedup:   {before / after:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Search Throughput Benchmark
+Replays recorded searches against the local stand-in server and reports
+throughput and latency percentiles of GoogleBooksAPI.search_books.
+
+Usage: python benchmarks/search_throughput.py fixtures --requests 500 --concurrency 8 --latency 0.08
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from books_api_standin import FixtureStore, StandInServer
+from google_books_api import GoogleBooksAPI
+from rate_limiter import TokenBucket
+
+
+def recorded_searches(store):
+    """(query, max_results, start_index, profile) for every recorded search"""
+    searches = []
+    for fixture in store:
+        path, _, query = fixture['request'].partition('?')
+        if path:
+            continue  # Single-volume lookup
+        params = dict(parse_qsl(query))
+        searches.append((
+            params['q'],
+            int(params.get('maxResults', 10)),
+            int(params.get('startIndex', 0)),
+            'list' if 'fields' in params else 'full'
+        ))
+    return searches
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', help="Fixture directory written by books_api_standin.py record")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.08)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--bandwidth', type=int, default=None)
+    args = parser.parse_args()
+
+    store = FixtureStore(args.directory)
+    searches = recorded_searches(store)
+    if not searches:
+        sys.exit(f"No recorded searches in {args.directory}")
+
+    server = StandInServer(
+        store, port=0, latency=args.latency,
+        error_rate=args.error_rate, bandwidth=args.bandwidth
+    ).start()
+
+    # No cache and no client-side pacing: measure the HTTP path itself
+    api = GoogleBooksAPI(
+        pool_maxsize=args.concurrency,
+        base_url=server.base_url,
+        rate_limiter=TokenBucket(rate=1e9, capacity=1e9)
+    )
+
+    def timed_search(i):
+        query, max_results, start_index, profile = searches[i % len(searches)]
+        started = time.perf_counter()
+        books = api.search_books(query, max_results, start_index, profile)
+        return time.perf_counter() - started, len(books)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(timed_search, range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [r[0] for r in results]
+    empty = sum(1 for r in results if r[1] == 0)
+    payload = api.payload_stats()
+
+    print(f"Requests:     {args.requests} ({len(searches)} distinct searches, concurrency {args.concurrency})")
+    print(f"Throughput:   {args.requests / elapsed:.1f} searches/s")
+    print(f"Latency:      p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+    print(f"Empty/failed: {empty}")
+    print(f"Payload:      {payload['bytes_received']} bytes, {payload['average_bytes']:.0f} bytes/request")
+
+    api.close()
+    server.stop()
+
+if __name__ == "__main__":
+    main()
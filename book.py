@@ -0,0 +1,75 @@
+"""
+Book Record
+Compact book record shared by the Google Books client, the database layer and the views.
+"""
+
+class Book:
+    """A book, optionally with the user's shelf data; uses __slots__ to keep large lists small"""
+
+    # Public fields, in the order used by to_dict()
+    FIELDS = (
+        'google_books_id', 'title', 'authors', 'description', 'cover_url', 'page_count',
+        'published_date', 'categories', 'preview_link', 'info_link',
+        'book_id', 'user_book_id', 'current_page', 'date_added', 'date_finished'
+    )
+
+    __slots__ = (
+        'google_books_id', 'title', 'authors', 'cover_url', 'page_count',
+        'published_date', 'categories', 'preview_link', 'info_link',
+        'book_id', 'user_book_id', 'current_page', 'date_added', 'date_finished',
+        '_description', '_description_loader'
+    )
+
+    def __init__(self, google_books_id='', title='Unknown Title', authors='Unknown Author',
+                 description=None, cover_url='', page_count=0, published_date='', categories='',
+                 preview_link='', info_link='', book_id=None, user_book_id=None, current_page=0,
+                 date_added=None, date_finished=None, description_loader=None):
+        """
+        Args:
+            description: Full description text, or None to load it on first access
+            description_loader: Callable(book_id) returning the description (e.g.
+                Database.get_book_description); shared by all books of a query
+            Other arguments are the book's fields (see FIELDS)
+        """
+        self.google_books_id = google_books_id
+        self.title = title
+        self.authors = authors
+        self.cover_url = cover_url
+        self.page_count = page_count
+        self.published_date = published_date
+        self.categories = categories
+        self.preview_link = preview_link
+        self.info_link = info_link
+        self.book_id = book_id
+        self.user_book_id = user_book_id
+        self.current_page = current_page
+        self.date_added = date_added
+        self.date_finished = date_finished
+        self._description = description
+        self._description_loader = description_loader
+
+    @property
+    def description(self):
+        """Description text, fetched through the loader the first time it is needed"""
+        if self._description is None and self._description_loader is not None:
+            self._description = self._description_loader(self.book_id) or ''
+            self._description_loader = None
+        return self._description if self._description is not None else ''
+
+    @description.setter
+    def description(self, value):
+        self._description = value
+        self._description_loader = None
+
+    @classmethod
+    def from_dict(cls, data, description_loader=None):
+        """Build a Book from a dictionary (API cache entry, database row), ignoring unknown keys"""
+        values = {field: data[field] for field in cls.FIELDS if field in data}
+        return cls(description_loader=description_loader, **values)
+
+    def to_dict(self):
+        """Plain dictionary of every field (loads the description if it is lazy)"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return f"Book({self.google_books_id!r}, {self.title!r})"
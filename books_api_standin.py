@@ -0,0 +1,231 @@
+"""
+Google Books API Stand-in
+Records real Google Books API responses to fixture files and replays them from a
+local HTTP server with configurable latency, error rate and bandwidth, so the app
+and its benchmarks can run without touching the real API.
+
+Record:  python books_api_standin.py record fixtures "harry potter" "dune" --pages 3
+Serve:   python books_api_standin.py serve fixtures --port 8765 --latency 0.08
+Use it:  GOOGLE_BOOKS_BASE_URL=http://127.0.0.1:8765/books/v1/volumes python main.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+VOLUMES_PATH = "/books/v1/volumes"
+
+class FixtureStore:
+    """Directory of recorded API responses keyed by request path and query"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def request_key(path, query):
+        """
+        Canonical form of a request relative to the volumes endpoint
+
+        Args:
+            path: Path below the volumes endpoint ('' for searches, '/<id>' for lookups)
+            query: Raw query string
+        """
+        params = sorted(parse_qsl(query, keep_blank_values=True))
+        return f"{path}?{urlencode(params)}"
+
+    def save(self, path, query, status, body):
+        """Write one response to its fixture file"""
+        key = self.request_key(path, query)
+        fixture = {'request': key, 'status': status, 'body': body.decode('utf-8')}
+        with open(self._file_for(key), 'w', encoding='utf-8') as f:
+            json.dump(fixture, f)
+
+    def load(self, path, query):
+        """Return (status, body bytes) for a request, or None if it was never recorded"""
+        file_path = self._file_for(self.request_key(path, query))
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, encoding='utf-8') as f:
+            fixture = json.load(f)
+        return fixture['status'], fixture['body'].encode('utf-8')
+
+    def __iter__(self):
+        """Yield every recorded fixture"""
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith('.json'):
+                with open(os.path.join(self.directory, name), encoding='utf-8') as f:
+                    yield json.load(f)
+
+    def _file_for(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+
+def enable_recording(api, store):
+    """
+    Save every API response a GoogleBooksAPI receives into a FixtureStore
+
+    Args:
+        api: GoogleBooksAPI instance (its session gets a response hook)
+        store: FixtureStore to write to
+    """
+    base_path = urlsplit(api.BASE_URL).path
+
+    def record(response, *args, **kwargs):
+        parts = urlsplit(response.url)
+        if parts.path.startswith(base_path):
+            store.save(parts.path[len(base_path):], parts.query, response.status_code, response.content)
+        return response
+
+    api.session.hooks['response'].append(record)
+
+
+class StandInServer:
+    """Local HTTP server replaying recorded Google Books responses"""
+
+    def __init__(self, store, host='127.0.0.1', port=8765, latency=0.0, error_rate=0.0, bandwidth=None):
+        """
+        Args:
+            store: FixtureStore with recorded responses
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free one)
+            latency: Seconds added before every response
+            error_rate: Fraction of requests answered with 503
+            bandwidth: Bytes per second the body is sent at (None for unlimited)
+        """
+        self.store = store
+        self.latency = latency
+        self.error_rate = error_rate
+        self.bandwidth = bandwidth
+        self.requests_served = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+
+            def do_GET(self):
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        """Volumes endpoint of this server, for GoogleBooksAPI(base_url=...)"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{VOLUMES_PATH}"
+
+    def start(self):
+        """Serve on a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="books-standin", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def handle(self, request):
+        """Answer one request from the fixtures"""
+        with self.lock:
+            self.requests_served += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        parts = urlsplit(request.path)
+        if self.error_rate and random.random() < self.error_rate:
+            status, body = 503, b'{"error": {"code": 503, "message": "Backend Error"}}'
+        elif not parts.path.startswith(VOLUMES_PATH):
+            status, body = 404, b'{"error": {"code": 404, "message": "Not Found"}}'
+        else:
+            fixture = self.store.load(parts.path[len(VOLUMES_PATH):], parts.query)
+            if fixture is None:
+                status, body = 404, b'{"error": {"code": 404, "message": "No recorded response"}}'
+            else:
+                status, body = fixture
+
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json; charset=UTF-8')
+        request.send_header('Content-Length', str(len(body)))
+        request.end_headers()
+        self._send_body(request.wfile, body)
+
+    def _send_body(self, stream, body):
+        """Write the body, throttled to the configured bandwidth"""
+        if not self.bandwidth:
+            stream.write(body)
+            return
+
+        chunk_size = max(1024, int(self.bandwidth / 20))
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start:start + chunk_size]
+            stream.write(chunk)
+            time.sleep(len(chunk) / self.bandwidth)
+
+
+def record_queries(directory, queries, pages=1, page_size=20):
+    """Run searches (and a lookup of every result) against the real API, saving the responses"""
+    from google_books_api import GoogleBooksAPI
+
+    api = GoogleBooksAPI()
+    enable_recording(api, FixtureStore(directory))
+    try:
+        for query in queries:
+            for page in range(pages):
+                books = api.search_books(query, page_size, page * page_size)
+                print(f"Recorded '{query}' page {page + 1}: {len(books)} books")
+                for book in books:
+                    api.get_book_by_id(book.google_books_id)
+    finally:
+        api.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay Google Books API responses")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('record', help="Record real API responses")
+    record.add_argument('directory')
+    record.add_argument('queries', nargs='+')
+    record.add_argument('--pages', type=int, default=1)
+    record.add_argument('--page-size', type=int, default=20)
+
+    serve = commands.add_parser('serve', help="Replay recorded responses over HTTP")
+    serve.add_argument('directory')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--latency', type=float, default=0.0, help="Seconds per response")
+    serve.add_argument('--error-rate', type=float, default=0.0, help="Fraction of 503 responses")
+    serve.add_argument('--bandwidth', type=int, default=None, help="Bytes per second")
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record_queries(args.directory, args.queries, args.pages, args.page_size)
+    else:
+        server = StandInServer(
+            FixtureStore(args.directory), args.host, args.port,
+            args.latency, args.error_rate, args.bandwidth
+        )
+        print(f"Serving {args.directory} at {server.base_url}")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
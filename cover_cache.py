@@ -0,0 +1,124 @@
+"""
+Cover Image Cache
+Process-wide two-tier cache for book covers: raw downloads and resized thumbnails
+on disk, plus an in-memory LRU of decoded thumbnails bounded by a byte budget.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from PIL import Image
+from search_cache import CACHE_DIR
+
+# Thumbnail sizes used by the views
+LIST_COVER_SIZE = (100, 150)   # Search results and currently reading cards
+GRID_COVER_SIZE = (130, 180)   # Finished books and favourites grid cards
+
+class CoverCache:
+    """Caches cover images by URL and thumbnail size"""
+
+    def __init__(self, fetch, directory=None, memory_budget=32 * 1024 * 1024):
+        """
+        Create the cache
+
+        Args:
+            fetch: Callable taking a URL and returning the raw image bytes
+            directory: Folder for the disk tier (defaults to CACHE_DIR/covers)
+            memory_budget: Maximum bytes of decoded pixels kept in memory
+        """
+        self.fetch = fetch
+        self.memory_budget = memory_budget
+        self.memory_bytes = 0
+        self.memory = OrderedDict()  # (url, size) -> PIL image
+        self.lock = threading.Lock()
+
+        self.directory = directory or os.path.join(CACHE_DIR, "covers")
+        self.raw_dir = os.path.join(self.directory, "raw")
+        self.thumb_dir = os.path.join(self.directory, "thumbs")
+        os.makedirs(self.raw_dir, exist_ok=True)
+        os.makedirs(self.thumb_dir, exist_ok=True)
+
+    def peek(self, url, size):
+        """Return the decoded thumbnail if it is in memory, without touching disk or network"""
+        key = (url, tuple(size))
+        with self.lock:
+            img = self.memory.get(key)
+            if img is not None:
+                self.memory.move_to_end(key)
+            return img
+
+    def get_thumbnail(self, url, size):
+        """
+        Get a resized cover, filling whichever tiers are missing
+
+        Args:
+            url: Cover image URL
+            size: (width, height) of the thumbnail
+
+        Returns:
+            Decoded PIL image of the requested size
+        """
+        size = tuple(size)
+        img = self.peek(url, size)
+        if img is not None:
+            return img
+
+        thumb_path = self._thumb_path(url, size)
+        if os.path.exists(thumb_path):
+            img = Image.open(thumb_path)
+            img.load()
+        else:
+            img = Image.open(BytesIO(self._get_raw(url)))
+            img = img.convert("RGB").resize(size, Image.Resampling.LANCZOS)
+            self._write_file(thumb_path, lambda f: img.save(f, format="PNG"))
+
+        self._remember((url, size), img)
+        return img
+
+    def clear_memory(self):
+        """Drop all decoded thumbnails from memory (disk tier is kept)"""
+        with self.lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+
+    def _get_raw(self, url):
+        """Return the original image bytes from disk, downloading them if needed"""
+        raw_path = os.path.join(self.raw_dir, self._url_hash(url))
+        if os.path.exists(raw_path):
+            with open(raw_path, "rb") as f:
+                return f.read()
+
+        data = self.fetch(url)
+        self._write_file(raw_path, lambda f: f.write(data))
+        return data
+
+    def _remember(self, key, img):
+        """Add a decoded image to the memory LRU and evict down to the byte budget"""
+        cost = img.width * img.height * len(img.getbands())
+        with self.lock:
+            if key in self.memory:
+                return
+            self.memory[key] = img
+            self.memory_bytes += cost
+            while self.memory_bytes > self.memory_budget and len(self.memory) > 1:
+                _, old = self.memory.popitem(last=False)
+                self.memory_bytes -= old.width * old.height * len(old.getbands())
+
+    def _thumb_path(self, url, size):
+        """Disk location of a thumbnail"""
+        return os.path.join(self.thumb_dir, f"{self._url_hash(url)}_{size[0]}x{size[1]}.png")
+
+    @staticmethod
+    def _url_hash(url):
+        """Stable file name for a URL"""
+        return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _write_file(path, writer):
+        """Write a file atomically so a crash never leaves a half-written image behind"""
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            writer(f)
+        os.replace(tmp_path, path)
@@ -5,125 +5,399 @@ book management, reviews, and reading streaks.
 """
 
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode
+from mysql.connector.pooling import MySQLConnectionPool
+from mysql.connector.errors import PoolError
 import hashlib
-from datetime import datetime
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import date, datetime
+from book import Book
+
+# Connection settings (change to your MySQL username and password)
+DB_CONFIG = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',
+    'database': 'book_tracker'
+}
+
+# Columns of a shelf row (books b JOIN user_books ub); description loads lazily
+SHELF_COLUMNS = """
+    b.book_id, b.google_books_id, b.title, b.authors, b.cover_url,
+    b.page_count, b.published_date, b.categories,
+    ub.current_page, ub.date_added, ub.date_finished, ub.id as user_book_id
+"""
+
+# A user's shelf, newest first; (date_added, id) matches idx_user_books_shelf
+SHELF_QUERY = f"""
+    SELECT {SHELF_COLUMNS}
+    FROM user_books ub
+    JOIN books b ON b.book_id = ub.book_id
+    WHERE ub.user_id = %s AND ub.status = %s
+    ORDER BY ub.date_added DESC, ub.id DESC
+"""
+
+# The finished shelf with each book's review (if any)
+FINISHED_QUERY = f"""
+    SELECT {SHELF_COLUMNS},
+           r.review_id, r.rating, r.review_text, r.created_at, r.updated_at
+    FROM user_books ub
+    JOIN books b ON b.book_id = ub.book_id
+    LEFT JOIN reviews r ON r.user_id = ub.user_id AND r.book_id = ub.book_id
+    WHERE ub.user_id = %s AND ub.status = 'finished'
+    ORDER BY ub.date_added DESC, ub.id DESC
+"""
+
+# Insert a book, or refresh the metadata of the stored copy with the same
+# google_books_id (empty new values keep the old ones). LAST_INSERT_ID(book_id)
+# makes cursor.lastrowid the existing row's id on the update path too.
+UPSERT_BOOK = """
+    INSERT INTO books (google_books_id, title, authors, description,
+                       cover_url, page_count, published_date, categories)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        book_id = LAST_INSERT_ID(book_id),
+        title = VALUES(title),
+        authors = VALUES(authors),
+        description = COALESCE(NULLIF(VALUES(description), ''), description),
+        cover_url = COALESCE(NULLIF(VALUES(cover_url), ''), cover_url),
+        page_count = COALESCE(NULLIF(VALUES(page_count), 0), page_count),
+        published_date = COALESCE(NULLIF(VALUES(published_date), ''), published_date),
+        categories = COALESCE(NULLIF(VALUES(categories), ''), categories)
+"""
+
+# Books that share a google_books_id, mapped to the oldest copy (which is kept).
+# DISTINCT keeps MySQL from merging it into a DELETE/UPDATE of books itself.
+DUPLICATE_BOOKS = """
+    SELECT DISTINCT b.book_id AS duplicate_id, k.keep_id
+    FROM books b
+    JOIN (
+        SELECT google_books_id, MIN(book_id) AS keep_id
+        FROM books
+        WHERE google_books_id IS NOT NULL
+        GROUP BY google_books_id
+        HAVING COUNT(*) > 1
+    ) k ON k.google_books_id = b.google_books_id
+    WHERE b.book_id <> k.keep_id
+"""
+
+# Schema changes applied once each, in order, after the base tables exist
+MIGRATIONS = (
+    # add_book/shelve_book upsert on Google Books ID and imports match books by it
+    ('001_unique_google_books_id', (
+        "UPDATE books SET google_books_id = NULL WHERE google_books_id = ''",
+        # Move shelves and reviews onto the kept copy; rows that would clash with
+        # an existing one stay behind and are removed with the duplicate book
+        f"""UPDATE IGNORE user_books ub JOIN ({DUPLICATE_BOOKS}) d ON d.duplicate_id = ub.book_id
+            SET ub.book_id = d.keep_id""",
+        f"""UPDATE IGNORE reviews r JOIN ({DUPLICATE_BOOKS}) d ON d.duplicate_id = r.book_id
+            SET r.book_id = d.keep_id""",
+        f"DELETE b FROM books b JOIN ({DUPLICATE_BOOKS}) d ON d.duplicate_id = b.book_id",
+        "ALTER TABLE books ADD UNIQUE INDEX idx_books_google_books_id (google_books_id)"
+    )),
+    # get_user_books: WHERE user_id AND status ORDER BY date_added, without a filesort
+    ('002_user_books_shelf_index', (
+        "ALTER TABLE user_books ADD INDEX idx_user_books_shelf (user_id, status, date_added)",
+    )),
+)
+
+class QueryCounter:
+    """Counts statements executed through Database.cursor() (see Database.count_queries)"""
+    
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+        self.lock = threading.Lock()
+        
+    def record(self, statement):
+        with self.lock:
+            self.count += 1
+            self.statements.append(statement)
+            
+            
+class CountingCursor:
+    """Cursor wrapper that reports every execute() to a QueryCounter"""
+    
+    def __init__(self, cursor, counter):
+        self.cursor = cursor
+        self.counter = counter
+        
+    def execute(self, operation, params=None, *args, **kwargs):
+        self.counter.record(operation)
+        return self.cursor.execute(operation, params, *args, **kwargs)
+        
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        self.counter.record(operation)
+        return self.cursor.executemany(operation, seq_params, *args, **kwargs)
+        
+    def __iter__(self):
+        return iter(self.cursor)
+        
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
 
 class Database:
     """Manages all database operations for the book tracking system"""
     
-    def __init__(self):
-        """Initialize database connection and create tables if they don't exist"""
-        self.connection = None
+    def __init__(self, pool_size=5, pool_timeout=10, ping_after=30, **config):
+        """
+        Initialize the connection pool and create tables if they don't exist
+        
+        Args:
+            pool_size: Number of pooled connections (threads borrowing at once)
+            pool_timeout: Seconds to wait for a free connection before giving up
+            ping_after: Seconds a connection may sit idle before it is health-checked again
+            config: Overrides for DB_CONFIG (host, user, password, database, ...)
+        """
+        self.config = {**DB_CONFIG, **config}
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+        self.ping_after = ping_after
+        self.pool = None
+        self.last_used = weakref.WeakKeyDictionary()  # Underlying connection -> time it was returned
+        # The pool raises instead of blocking when it is exhausted, so waiters queue here
+        self.available = threading.BoundedSemaphore(pool_size)
+        self.pool_lock = threading.Lock()
+        self.query_counter = None  # Set while count_queries() is active
         self.connect()
         self.create_tables()
         
     def connect(self):
-        """Establish connection to MySQL database"""
-        try:
-            self.connection = mysql.connector.connect(
-                host='localhost',
-                user='root',  # Change to your MySQL username
-                password='',  # Change to your MySQL password
-                database='book_tracker'
-            )
-            if self.connection.is_connected():
-                print("Successfully connected to MySQL database")
-        except Error as e:
-            print(f"Error connecting to MySQL: {e}")
-            # Try to create database if it doesn't exist
+        """Create the connection pool, creating the database first if it doesn't exist"""
+        with self.pool_lock:
+            if self.pool is not None:
+                return True
             try:
-                temp_conn = mysql.connector.connect(
-                    host='localhost',
-                    user='root',
-                    password=''
+                self.pool = MySQLConnectionPool(
+                    pool_name="book_tracker",
+                    pool_size=self.pool_size,
+                    # Every borrow is one committed or rolled-back transaction that
+                    # sets no session state, so there is nothing to reset on return
+                    pool_reset_session=False,
+                    **self.config
                 )
-                cursor = temp_conn.cursor()
-                cursor.execute("CREATE DATABASE IF NOT EXISTS book_tracker")
-                temp_conn.close()
-                self.connect()  # Reconnect to the newly created database
-            except Error as e2:
-                print(f"Error creating database: {e2}")
+                print("Successfully connected to MySQL database")
+                return True
+            except Error as e:
+                if e.errno != errorcode.ER_BAD_DB_ERROR:
+                    print(f"Error connecting to MySQL: {e}")
+                    return False
+                
+        # Try to create database if it doesn't exist
+        try:
+            server_config = {k: v for k, v in self.config.items() if k != 'database'}
+            temp_conn = mysql.connector.connect(**server_config)
+            cursor = temp_conn.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{self.config['database']}`")
+            temp_conn.close()
+        except Error as e2:
+            print(f"Error creating database: {e2}")
+            return False
+        return self.connect()  # Reconnect to the newly created database
+        
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a pooled connection for the duration of a with block
+        
+        A connection that has been idle for more than ping_after seconds (or is
+        new) is health-checked, and transparently reconnected, before it is handed
+        out; recently used ones skip the extra round trip. It is returned to the
+        pool afterwards.
+        
+        Raises:
+            Error: If the database is unreachable or no connection frees up in time
+        """
+        if self.pool is None and not self.connect():
+            raise Error("Not connected to the database")
+        if not self.available.acquire(timeout=self.pool_timeout):
+            raise PoolError(f"No database connection free after {self.pool_timeout}s")
+        try:
+            conn = self.pool.get_connection()
+            # The pool hands out a new wrapper each time; idle time is kept per real connection
+            raw = getattr(conn, '_cnx', conn)
+            try:
+                if time.monotonic() - self.last_used.get(raw, float('-inf')) > self.ping_after:
+                    conn.ping(reconnect=True, attempts=3, delay=1)
+                yield conn
+            except Exception:
+                self.last_used.pop(raw, None)  # Check it again before its next use
+                raise
+            else:
+                self.last_used[raw] = time.monotonic()
+            finally:
+                conn.close()  # Returns it to the pool
+        finally:
+            self.available.release()
+            
+    @contextmanager
+    def cursor(self, dictionary=False, buffered=True):
+        """
+        Borrow a cursor on a pooled connection as one transaction
+        
+        Commits when the with block exits normally and rolls back otherwise, including
+        when a generator streaming from it is closed early (GeneratorExit), so a
+        connection never goes back to the pool inside an open transaction.
+        
+        Args:
+            dictionary: Return rows as dictionaries instead of tuples
+            buffered: Fetch the whole result on execute, so rows left unread can't
+                block the commit (pass False to stream a large result, reading it to the end)
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=dictionary, buffered=buffered)
+            counter = self.query_counter
+            committed = False
+            try:
+                yield CountingCursor(cursor, counter) if counter else cursor
+                conn.commit()
+                committed = True
+            finally:
+                try:
+                    if not committed:
+                        conn.rollback()
+                finally:
+                    cursor.close()
                 
+    @contextmanager
+    def count_queries(self):
+        """
+        Count the statements run (from any thread) inside a with block, e.g. to
+        check that drawing a shelf doesn't issue one query per book:
+        
+            with db.count_queries() as counter:
+                db.get_finished_books_with_reviews(user_id)
+            assert counter.count == 1, counter.statements
+        """
+        counter = QueryCounter()
+        previous, self.query_counter = self.query_counter, counter
+        try:
+            yield counter
+        finally:
+            self.query_counter = previous
+            
     def create_tables(self):
         """Create all necessary tables in the database"""
-        if not self.connection or not self.connection.is_connected():
+        if self.pool is None:
             return
             
-        cursor = self.connection.cursor()
-        
-        # Users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INT AUTO_INCREMENT PRIMARY KEY,
-                username VARCHAR(50) UNIQUE NOT NULL,
-                password_hash VARCHAR(64) NOT NULL,
-                email VARCHAR(100),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Books table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS books (
-                book_id INT AUTO_INCREMENT PRIMARY KEY,
-                google_books_id VARCHAR(50),
-                title VARCHAR(255) NOT NULL,
-                authors TEXT,
-                description TEXT,
-                cover_url TEXT,
-                page_count INT,
-                published_date VARCHAR(50),
-                categories TEXT
-            )
-        """)
-        
-        # User books table (tracks reading status)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS user_books (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL,
-                book_id INT NOT NULL,
-                status ENUM('currently_reading', 'finished', 'favourite') NOT NULL,
-                current_page INT DEFAULT 0,
-                date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                date_finished TIMESTAMP NULL,
-                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-                FOREIGN KEY (book_id) REFERENCES books(book_id) ON DELETE CASCADE,
-                UNIQUE KEY unique_user_book_status (user_id, book_id, status)
-            )
-        """)
-        
-        # Reviews table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reviews (
-                review_id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL,
-                book_id INT NOT NULL,
-                rating INT CHECK (rating BETWEEN 1 AND 5),
-                review_text TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-                FOREIGN KEY (book_id) REFERENCES books(book_id) ON DELETE CASCADE,
-                UNIQUE KEY unique_user_review (user_id, book_id)
-            )
-        """)
-        
-        # Reading streaks table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS reading_streaks (
-                streak_id INT AUTO_INCREMENT PRIMARY KEY,
-                user_id INT NOT NULL,
-                date DATE NOT NULL,
-                pages_read INT DEFAULT 0,
-                FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
-                UNIQUE KEY unique_user_date (user_id, date)
-            )
-        """)
-        
-        self.connection.commit()
-        cursor.close()
+        with self.cursor() as cursor:
+            # Users table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    user_id INT AUTO_INCREMENT PRIMARY KEY,
+                    username VARCHAR(50) UNIQUE NOT NULL,
+                    password_hash VARCHAR(64) NOT NULL,
+                    email VARCHAR(100),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+        
+            # Books table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS books (
+                    book_id INT AUTO_INCREMENT PRIMARY KEY,
+                    google_books_id VARCHAR(50),
+                    title VARCHAR(255) NOT NULL,
+                    authors TEXT,
+                    description TEXT,
+                    cover_url TEXT,
+                    page_count INT,
+                    published_date VARCHAR(50),
+                    categories TEXT
+                )
+            """)
+        
+            # User books table (tracks reading status)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_books (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    user_id INT NOT NULL,
+                    book_id INT NOT NULL,
+                    status ENUM('currently_reading', 'finished', 'favourite') NOT NULL,
+                    current_page INT DEFAULT 0,
+                    date_added TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    date_finished TIMESTAMP NULL,
+                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                    FOREIGN KEY (book_id) REFERENCES books(book_id) ON DELETE CASCADE,
+                    UNIQUE KEY unique_user_book_status (user_id, book_id, status)
+                )
+            """)
+        
+            # Reviews table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS reviews (
+                    review_id INT AUTO_INCREMENT PRIMARY KEY,
+                    user_id INT NOT NULL,
+                    book_id INT NOT NULL,
+                    rating INT CHECK (rating BETWEEN 1 AND 5),
+                    review_text TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                    FOREIGN KEY (book_id) REFERENCES books(book_id) ON DELETE CASCADE,
+                    UNIQUE KEY unique_user_review (user_id, book_id)
+                )
+            """)
+        
+            # Reading streaks table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS reading_streaks (
+                    streak_id INT AUTO_INCREMENT PRIMARY KEY,
+                    user_id INT NOT NULL,
+                    date DATE NOT NULL,
+                    pages_read INT DEFAULT 0,
+                    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+                    UNIQUE KEY unique_user_date (user_id, date)
+                )
+            """)
+            
+            # Applied schema migrations
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version VARCHAR(100) PRIMARY KEY,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+        self.apply_migrations()
+        
+    def apply_migrations(self):
+        """
+        Run every schema migration that hasn't been applied yet
+        
+        Returns:
+            List of the versions applied by this call
+            
+        Raises:
+            Error: If a migration fails. The app must not start without them:
+                add_book, shelve_book and imports rely on the unique google_books_id
+                key of 001 and would silently insert duplicate books without it.
+        """
+        applied = []
+        with self.cursor() as cursor:
+            cursor.execute("SELECT version FROM schema_migrations")
+            done = {row[0] for row in cursor.fetchall()}
+            
+        for version, statements in MIGRATIONS:
+            if version in done:
+                continue
+            try:
+                with self.cursor() as cursor:
+                    for statement in statements:
+                        cursor.execute(statement)
+                    cursor.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+            except Error as e:
+                # Later migrations may depend on this one, so stop here
+                print(f"Error applying schema migration {version}: {e}")
+                raise
+            print(f"Applied schema migration {version}")
+            applied.append(version)
+        return applied
         
     def hash_password(self, password):
         """Hash password using SHA-256"""
@@ -132,14 +406,12 @@ class Database:
     def register_user(self, username, password, email=""):
         """Register a new user"""
         try:
-            cursor = self.connection.cursor()
             password_hash = self.hash_password(password)
-            cursor.execute(
-                "INSERT INTO users (username, password_hash, email) VALUES (%s, %s, %s)",
-                (username, password_hash, email)
-            )
-            self.connection.commit()
-            cursor.close()
+            with self.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO users (username, password_hash, email) VALUES (%s, %s, %s)",
+                    (username, password_hash, email)
+                )
             return True, "Registration successful!"
         except mysql.connector.IntegrityError:
             return False, "Username already exists!"
@@ -149,14 +421,13 @@ class Database:
     def login_user(self, username, password):
         """Authenticate user login"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
             password_hash = self.hash_password(password)
-            cursor.execute(
-                "SELECT user_id, username FROM users WHERE username = %s AND password_hash = %s",
-                (username, password_hash)
-            )
-            user = cursor.fetchone()
-            cursor.close()
+            with self.cursor(dictionary=True) as cursor:
+                cursor.execute(
+                    "SELECT user_id, username FROM users WHERE username = %s AND password_hash = %s",
+                    (username, password_hash)
+                )
+                user = cursor.fetchone()
             if user:
                 return True, user['user_id'], user['username']
             return False, None, "Invalid username or password"
@@ -164,89 +435,504 @@ class Database:
             return False, None, f"Error: {e}"
             
     def add_book(self, book_data):
-        """Add a book to the database or return existing book_id"""
+        """
+        Add a Book to the database or refresh the stored copy, returning its book_id
+        
+        One statement: on a duplicate google_books_id the existing row's metadata is
+        refreshed and LAST_INSERT_ID(book_id) hands back its id.
+        """
+        values = self._book_values(book_data)
         try:
-            cursor = self.connection.cursor()
-            
-            # Check if book already exists
-            cursor.execute(
-                "SELECT book_id FROM books WHERE google_books_id = %s",
-                (book_data.get('google_books_id'),)
-            )
-            result = cursor.fetchone()
-            
-            if result:
-                cursor.close()
-                return result[0]
-                
-            # Insert new book
-            cursor.execute("""
-                INSERT INTO books (google_books_id, title, authors, description, 
-                                 cover_url, page_count, published_date, categories)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                book_data.get('google_books_id'),
-                book_data.get('title'),
-                book_data.get('authors'),
-                book_data.get('description'),
-                book_data.get('cover_url'),
-                book_data.get('page_count'),
-                book_data.get('published_date'),
-                book_data.get('categories')
-            ))
-            
-            book_id = cursor.lastrowid
-            self.connection.commit()
-            cursor.close()
-            return book_id
+            with self.cursor() as cursor:
+                cursor.execute(UPSERT_BOOK, values)
+                return cursor.lastrowid
         except Error as e:
             print(f"Error adding book: {e}")
             return None
             
+    @staticmethod
+    def _book_values(book):
+        """Parameters of UPSERT_BOOK for a Book"""
+        return (
+            book.google_books_id or None,  # Unique, so store a missing ID as NULL
+            book.title,
+            book.authors,
+            book.description,
+            book.cover_url,
+            book.page_count,
+            book.published_date,
+            book.categories
+        )
+        
+    def get_library_google_ids(self, user_id):
+        """Get the Google Books IDs of every book in a user's collection"""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute("""
+                    SELECT DISTINCT b.google_books_id
+                    FROM books b
+                    JOIN user_books ub ON b.book_id = ub.book_id
+                    WHERE ub.user_id = %s AND b.google_books_id IS NOT NULL
+                """, (user_id,))
+                return [row[0] for row in cursor.fetchall()]
+        except Error as e:
+            print(f"Error getting library ids: {e}")
+            return []
+            
+    def update_books_metadata(self, books):
+        """
+        Refresh metadata of many Book records (matched on google_books_id) in one transaction
+        
+        Written with UPSERT_BOOK, which executemany sends as one multi-row INSERT
+        (an UPDATE would be run once per book). Empty new values keep the stored ones.
+        
+        Returns:
+            Number of books written
+        """
+        books = [book for book in books if book.google_books_id]
+        if not books:
+            return 0
+        try:
+            with self.cursor() as cursor:
+                cursor.executemany(UPSERT_BOOK, [self._book_values(book) for book in books])
+            return len(books)
+        except Error as e:
+            print(f"Error updating book metadata: {e}")
+            return 0
+            
+    def import_books_batch(self, user_id, entries):
+        """
+        Write one batch of imported books, shelf entries and reviews in a single transaction
+        
+        Books are matched on google_books_id, so books already in the table are
+        reused and only missing ones are inserted; shelf entries and reviews the
+        user already has are left as they are.
+        
+        Args:
+            user_id: Owner of the shelves
+            entries: List of (Book, status, date_added, date_finished, current_page,
+                rating, review_text); everything after status may be None
+            
+        Returns:
+            (books_added, shelved, reviewed) counts, or None if the batch was rolled back
+        """
+        if not entries:
+            return 0, 0, 0
+        try:
+            with self.cursor() as cursor:
+                books_added = self._insert_missing_books(cursor, [entry[0] for entry in entries])
+                
+                book_ids = list({book.book_id for book, *_ in entries})
+                placeholders = ', '.join(['%s'] * len(book_ids))
+                cursor.execute(
+                    f"SELECT book_id, status FROM user_books WHERE user_id = %s AND book_id IN ({placeholders})",
+                    [user_id] + book_ids
+                )
+                shelved_already = set(cursor.fetchall())
+                
+                new_entries = {}
+                reviews = {}
+                for book, status, date_added, date_finished, current_page, rating, review_text in entries:
+                    if (book.book_id, status) not in shelved_already:
+                        new_entries[(book.book_id, status)] = (
+                            user_id, book.book_id, status, current_page, date_added, status, date_finished
+                        )
+                    if rating or review_text:
+                        reviews[book.book_id] = (user_id, book.book_id, rating, review_text)
+                if new_entries:
+                    # ON DUPLICATE KEY guards against a concurrent add of the same entry
+                    cursor.executemany("""
+                        INSERT INTO user_books (user_id, book_id, status, current_page, date_added, date_finished)
+                        VALUES (%s, %s, %s, COALESCE(%s, 0), COALESCE(%s, CURRENT_TIMESTAMP),
+                                IF(%s = 'finished', COALESCE(%s, CURRENT_TIMESTAMP), NULL))
+                        ON DUPLICATE KEY UPDATE id = id
+                    """, list(new_entries.values()))
+                reviewed = 0
+                if reviews:
+                    placeholders = ', '.join(['%s'] * len(reviews))
+                    cursor.execute(
+                        f"SELECT book_id FROM reviews WHERE user_id = %s AND book_id IN ({placeholders})",
+                        [user_id] + list(reviews)
+                    )
+                    for (book_id,) in cursor.fetchall():
+                        del reviews[book_id]
+                    if reviews:
+                        cursor.executemany("""
+                            INSERT INTO reviews (user_id, book_id, rating, review_text)
+                            VALUES (%s, %s, %s, %s)
+                            ON DUPLICATE KEY UPDATE review_id = review_id
+                        """, list(reviews.values()))
+                        reviewed = len(reviews)
+            return books_added, len(new_entries), reviewed
+        except Error as e:
+            print(f"Error importing books: {e}")
+            return None
+            
+    def import_reading_streaks(self, user_id, streaks):
+        """
+        Write imported reading days in one transaction
+        
+        A day already stored keeps the larger page count, so importing the same
+        export twice doesn't add its pages up again.
+        
+        Args:
+            user_id: Owner of the streaks
+            streaks: List of (date, pages_read)
+            
+        Returns:
+            Number of days written, or None if the batch was rolled back
+        """
+        if not streaks:
+            return 0
+        try:
+            with self.cursor() as cursor:
+                cursor.executemany("""
+                    INSERT INTO reading_streaks (user_id, date, pages_read)
+                    VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE pages_read = GREATEST(pages_read, VALUES(pages_read))
+                """, [(user_id, day, pages_read) for day, pages_read in streaks])
+            return len(streaks)
+        except Error as e:
+            print(f"Error importing reading streaks: {e}")
+            return None
+            
+    def get_book_ids(self, google_ids):
+        """
+        Look up which Google Books IDs are already stored, in one query
+        
+        Returns:
+            Dictionary mapping each stored Google Books ID to its book_id
+        """
+        try:
+            with self.cursor() as cursor:
+                return self._book_ids(cursor, list(google_ids))
+        except Error as e:
+            print(f"Error looking up books: {e}")
+            return {}
+            
+    def _insert_missing_books(self, cursor, books):
+        """
+        Insert the books that aren't in the table yet and set book.book_id on every Book
+        
+        Args:
+            cursor: Cursor of the caller's transaction
+            books: Books with a google_books_id
+            
+        Returns:
+            Number of books inserted
+        """
+        by_google_id = {book.google_books_id: book for book in books}
+        book_ids = self._book_ids(cursor, list(by_google_id))
+        missing = [book for google_id, book in by_google_id.items() if google_id not in book_ids]
+        
+        if missing:
+            # ON DUPLICATE KEY guards against a concurrent insert of the same volume
+            cursor.executemany("""
+                INSERT INTO books (google_books_id, title, authors, description,
+                                   cover_url, page_count, published_date, categories)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE book_id = book_id
+            """, [self._book_values(book) for book in missing])
+            book_ids.update(self._book_ids(cursor, [book.google_books_id for book in missing]))
+            
+        for book in books:
+            book.book_id = book_ids.get(book.google_books_id)
+        return len(missing)
+        
+    @staticmethod
+    def _book_ids(cursor, google_ids):
+        """Map Google Books IDs to book_id for the ones stored in the books table"""
+        if not google_ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(google_ids))
+        cursor.execute(
+            f"SELECT google_books_id, book_id FROM books WHERE google_books_id IN ({placeholders})",
+            google_ids
+        )
+        return dict(cursor.fetchall())
+        
     def add_user_book(self, user_id, book_id, status):
         """Add a book to user's collection with a specific status"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                INSERT INTO user_books (user_id, book_id, status)
-                VALUES (%s, %s, %s)
-                ON DUPLICATE KEY UPDATE date_added = CURRENT_TIMESTAMP
-            """, (user_id, book_id, status))
-            self.connection.commit()
-            cursor.close()
+            with self.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO user_books (user_id, book_id, status, date_finished)
+                    VALUES (%s, %s, %s, IF(%s = 'finished', CURRENT_TIMESTAMP, NULL))
+                    ON DUPLICATE KEY UPDATE date_added = CURRENT_TIMESTAMP
+                """, (user_id, book_id, status, status))
             return True
         except Error as e:
             print(f"Error adding user book: {e}")
             return False
             
+    def shelve_book(self, user_id, book, status):
+        """
+        Store a Book (or refresh the stored copy) and put it on a user's shelf
+        in one transaction, e.g. when adding a search result
+        
+        Sets book.book_id.
+        
+        Returns:
+            True on success, False otherwise
+        """
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(UPSERT_BOOK, self._book_values(book))
+                book_id = cursor.lastrowid
+                cursor.execute("""
+                    INSERT INTO user_books (user_id, book_id, status, date_finished)
+                    VALUES (%s, %s, %s, IF(%s = 'finished', CURRENT_TIMESTAMP, NULL))
+                    ON DUPLICATE KEY UPDATE date_added = CURRENT_TIMESTAMP
+                """, (user_id, book_id, status, status))
+            book.book_id = book_id
+            return True
+        except Error as e:
+            print(f"Error adding book to shelf: {e}")
+            return False
+            
+    def transition_book(self, user_id, book_id, from_status, to_status):
+        """
+        Move a book from one shelf to another in a single transaction
+        
+        The shelf entry is updated in place (one UPDATE, one commit), so a crash
+        can never leave the book on neither shelf. date_finished is set when the
+        book moves to 'finished' and cleared when it leaves it.
+        
+        Args:
+            user_id: Owner of the shelf entry
+            book_id: Book to move
+            from_status: Shelf it is on now
+            to_status: Shelf to move it to
+            
+        Returns:
+            True if the book was moved (or was already on the target shelf),
+            False if it wasn't on from_status or the update failed
+        """
+        try:
+            with self.cursor() as cursor:
+                try:
+                    cursor.execute("""
+                        UPDATE user_books
+                        SET status = %s,
+                            date_added = CURRENT_TIMESTAMP,
+                            date_finished = IF(%s = 'finished', CURRENT_TIMESTAMP, NULL)
+                        WHERE user_id = %s AND book_id = %s AND status = %s
+                    """, (to_status, to_status, user_id, book_id, from_status))
+                    return cursor.rowcount > 0
+                except mysql.connector.IntegrityError as e:
+                    if e.errno != errorcode.ER_DUP_ENTRY:
+                        raise
+                    # Already on the target shelf: only the source entry has to go.
+                    # The failed UPDATE rolled back by itself; the transaction is still open.
+                    cursor.execute(
+                        "DELETE FROM user_books WHERE user_id = %s AND book_id = %s AND status = %s",
+                        (user_id, book_id, from_status)
+                    )
+                    if to_status == 'finished':
+                        cursor.execute("""
+                            UPDATE user_books SET date_finished = COALESCE(date_finished, CURRENT_TIMESTAMP)
+                            WHERE user_id = %s AND book_id = %s AND status = 'finished'
+                        """, (user_id, book_id))
+                    return True
+        except Error as e:
+            print(f"Error moving book: {e}")
+            return False
+            
     def get_user_books(self, user_id, status):
-        """Get all books for a user with a specific status"""
+        """Get all books for a user with a specific status (descriptions load lazily)"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT b.*, ub.current_page, ub.date_added, ub.date_finished, ub.id as user_book_id
-                FROM books b
-                JOIN user_books ub ON b.book_id = ub.book_id
-                WHERE ub.user_id = %s AND ub.status = %s
-                ORDER BY ub.date_added DESC
-            """, (user_id, status))
-            books = cursor.fetchall()
-            cursor.close()
-            return books
+            with self.cursor(dictionary=True) as cursor:
+                cursor.execute(SHELF_QUERY, (user_id, status))
+                rows = cursor.fetchall()
+            loader = self.get_book_description
+            return [Book.from_dict(row, loader) for row in rows]
         except Error as e:
             print(f"Error getting user books: {e}")
             return []
             
+    def get_user_books_page(self, user_id, status, page_size=50, after=None):
+        """
+        Get one page of a shelf, newest first, using keyset pagination
+        
+        Each page is an index seek on (user_id, status, date_added, id), so late
+        pages cost the same as the first one (unlike LIMIT/OFFSET).
+        
+        Args:
+            user_id: Owner of the shelf
+            status: Shelf to read
+            page_size: Maximum number of books returned
+            after: Cursor returned with the previous page (None for the first page)
+            
+        Returns:
+            (books, next_cursor); next_cursor is None on the last page
+        """
+        try:
+            with self.cursor(dictionary=True) as cursor:
+                if after is None:
+                    cursor.execute(f"""
+                        SELECT {SHELF_COLUMNS}
+                        FROM user_books ub
+                        JOIN books b ON b.book_id = ub.book_id
+                        WHERE ub.user_id = %s AND ub.status = %s
+                        ORDER BY ub.date_added DESC, ub.id DESC
+                        LIMIT %s
+                    """, (user_id, status, page_size + 1))
+                else:
+                    date_added, user_book_id = after
+                    cursor.execute(f"""
+                        SELECT {SHELF_COLUMNS}
+                        FROM user_books ub
+                        JOIN books b ON b.book_id = ub.book_id
+                        WHERE ub.user_id = %s AND ub.status = %s
+                        AND (ub.date_added < %s OR (ub.date_added = %s AND ub.id < %s))
+                        ORDER BY ub.date_added DESC, ub.id DESC
+                        LIMIT %s
+                    """, (user_id, status, date_added, date_added, user_book_id, page_size + 1))
+                rows = cursor.fetchall()
+                
+            # One extra row tells whether another page exists without a second query
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = (rows[-1]['date_added'], rows[-1]['user_book_id'])
+            loader = self.get_book_description
+            return [Book.from_dict(row, loader) for row in rows], next_cursor
+        except Error as e:
+            print(f"Error getting user books page: {e}")
+            return [], None
+            
+    def iter_user_books(self, user_id, status, batch_size=100):
+        """
+        Stream a shelf in batches from an unbuffered cursor, newest first
+        
+        Rows are read off the connection as the batches are consumed, so the whole
+        shelf never has to be held in memory. The generator keeps a pooled
+        connection until it is exhausted or closed.
+        
+        Yields:
+            Lists of up to batch_size Books
+        """
+        loader = self.get_book_description
+        for rows in self._stream(SHELF_QUERY, (user_id, status), batch_size):
+            yield [Book.from_dict(row, loader) for row in rows]
+            
+    def get_finished_books_with_reviews(self, user_id):
+        """
+        Get the finished shelf together with the user's reviews in one query
+        
+        Returns:
+            List of (Book, review) pairs, newest first; review is a dict with the
+            reviews table's columns, or None if the book hasn't been reviewed
+        """
+        try:
+            with self.cursor(dictionary=True) as cursor:
+                cursor.execute(FINISHED_QUERY, (user_id,))
+                rows = cursor.fetchall()
+            return [self._book_with_review(row, user_id) for row in rows]
+        except Error as e:
+            print(f"Error getting finished books: {e}")
+            return []
+            
+    def iter_finished_books_with_reviews(self, user_id, batch_size=100):
+        """Stream get_finished_books_with_reviews() in batches (see iter_user_books)"""
+        for rows in self._stream(FINISHED_QUERY, (user_id,), batch_size):
+            yield [self._book_with_review(row, user_id) for row in rows]
+            
+    def iter_library_export(self, user_id, batch_size=500):
+        """
+        Stream every shelf entry of a user joined with its book and review (see iter_user_books)
+        
+        Yields:
+            Lists of dictionary rows
+            
+        Raises:
+            Error: If the query fails part way (an export must not end silently)
+        """
+        yield from self._stream("""
+            SELECT ub.status, ub.current_page, ub.date_added, ub.date_finished,
+                   b.google_books_id, b.title, b.authors, b.description, b.cover_url,
+                   b.page_count, b.published_date, b.categories,
+                   r.rating, r.review_text, r.created_at AS reviewed_at,
+                   r.updated_at AS review_updated_at
+            FROM user_books ub
+            JOIN books b ON b.book_id = ub.book_id
+            LEFT JOIN reviews r ON r.user_id = ub.user_id AND r.book_id = ub.book_id
+            WHERE ub.user_id = %s
+            ORDER BY ub.id
+        """, (user_id,), batch_size, raise_errors=True)
+        
+    def iter_reading_streaks(self, user_id, batch_size=500):
+        """
+        Stream all of a user's reading streak days, oldest first, as lists of dictionary rows
+        
+        Raises:
+            Error: If the query fails part way (an export must not end silently)
+        """
+        yield from self._stream("""
+            SELECT date, pages_read FROM reading_streaks
+            WHERE user_id = %s
+            ORDER BY date
+        """, (user_id,), batch_size, raise_errors=True)
+        
+    def _stream(self, query, params, batch_size, raise_errors=False):
+        """
+        Yield lists of dictionary rows read from an unbuffered cursor
+        
+        Args:
+            raise_errors: Re-raise a MySQL error instead of printing it and ending
+                the stream early (views show what arrived; exports must fail)
+        """
+        try:
+            with self.cursor(dictionary=True, buffered=False) as cursor:
+                cursor.execute(query, params)
+                try:
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        yield rows
+                finally:
+                    # A streamed result has to be read to the end before the connection is reused
+                    cursor.fetchall()
+        except Error as e:
+            print(f"Error streaming rows: {e}")
+            if raise_errors:
+                raise
+            
+    def _book_with_review(self, row, user_id):
+        """Split a FINISHED_QUERY row into (Book, review or None)"""
+        review = None
+        if row['review_id'] is not None:
+            review = {
+                'review_id': row['review_id'],
+                'user_id': user_id,
+                'book_id': row['book_id'],
+                'rating': row['rating'],
+                'review_text': row['review_text'],
+                'created_at': row['created_at'],
+                'updated_at': row['updated_at']
+            }
+        return Book.from_dict(row, self.get_book_description), review
+        
+    def get_book_description(self, book_id):
+        """Get the description of a single book"""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute("SELECT description FROM books WHERE book_id = %s", (book_id,))
+                row = cursor.fetchone()
+            return row[0] if row else None
+        except Error as e:
+            print(f"Error getting book description: {e}")
+            return None
+            
     def update_book_progress(self, user_book_id, current_page):
         """Update the current page for a book being read"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(
-                "UPDATE user_books SET current_page = %s WHERE id = %s",
-                (current_page, user_book_id)
-            )
-            self.connection.commit()
-            cursor.close()
+            with self.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE user_books SET current_page = %s WHERE id = %s",
+                    (current_page, user_book_id)
+                )
             return True
         except Error as e:
             print(f"Error updating progress: {e}")
@@ -256,17 +942,15 @@ class Database:
 
         """Add or update a book review"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                INSERT INTO reviews (user_id, book_id, rating, review_text)
-                VALUES (%s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE 
-                    rating = VALUES(rating),
-                    review_text = VALUES(review_text),
-                    updated_at = CURRENT_TIMESTAMP
-            """, (user_id, book_id, rating, review_text))
-            self.connection.commit()
-            cursor.close()
+            with self.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO reviews (user_id, book_id, rating, review_text)
+                    VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE 
+                        rating = VALUES(rating),
+                        review_text = VALUES(review_text),
+                        updated_at = CURRENT_TIMESTAMP
+                """, (user_id, book_id, rating, review_text))
             return True
         except Error as e:
             print(f"Error adding review: {e}")
@@ -275,14 +959,12 @@ class Database:
     def delete_review(self, user_id, book_id):
 
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(
-                "DELETE FROM reviews WHERE user_id = %s AND book_id = %s",
-                (user_id, book_id)
-            )
-            self.connection.commit()
-            rows_affected = cursor.rowcount
-            cursor.close()
+            with self.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM reviews WHERE user_id = %s AND book_id = %s",
+                    (user_id, book_id)
+                )
+                rows_affected = cursor.rowcount
             return rows_affected > 0
         except Error as e:
             print(f"Error deleting review: {e}")
@@ -291,14 +973,12 @@ class Database:
     def get_review(self, user_id, book_id):
         """Get a user's review for a specific book"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(
-                "SELECT * FROM reviews WHERE user_id = %s AND book_id = %s",
-                (user_id, book_id)
-            )
-            review = cursor.fetchone()
-            cursor.close()
-            return review
+            with self.cursor(dictionary=True) as cursor:
+                cursor.execute(
+                    "SELECT * FROM reviews WHERE user_id = %s AND book_id = %s",
+                    (user_id, book_id)
+                )
+                return cursor.fetchone()
         except Error as e:
             print(f"Error getting review: {e}")
             return None
@@ -306,32 +986,83 @@ class Database:
     def add_reading_streak(self, user_id, date, pages_read=0):
         """Add or update a reading streak for a specific date"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("""
-                INSERT INTO reading_streaks (user_id, date, pages_read)
-                VALUES (%s, %s, %s)
-                ON DUPLICATE KEY UPDATE pages_read = pages_read + VALUES(pages_read)
-            """, (user_id, date, pages_read))
-            self.connection.commit()
-            cursor.close()
+            with self.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO reading_streaks (user_id, date, pages_read)
+                    VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE pages_read = pages_read + VALUES(pages_read)
+                """, (user_id, date, pages_read))
             return True
         except Error as e:
             print(f"Error adding reading streak: {e}")
             return False
             
+    def write_progress_batch(self, progress, streaks):
+        """
+        Write buffered reading progress and streak days in one transaction
+        (see WriteBehindBuffer)
+        
+        Args:
+            progress: (current_page, user_book_id) pairs, one per shelf entry
+            streaks: (user_id, date, pages_read) tuples, one per user and day
+            
+        Returns:
+            True if everything committed, False if it was rolled back
+        """
+        try:
+            with self.cursor() as cursor:
+                if progress:
+                    # One UPDATE for every book instead of a statement each
+                    cases = " ".join("WHEN %s THEN %s" for _ in progress)
+                    placeholders = ", ".join(["%s"] * len(progress))
+                    params = [value for page, user_book_id in progress for value in (user_book_id, page)]
+                    params += [user_book_id for page, user_book_id in progress]
+                    cursor.execute(
+                        f"UPDATE user_books SET current_page = CASE id {cases} END "
+                        f"WHERE id IN ({placeholders})",
+                        params
+                    )
+                if streaks:
+                    # executemany sends the rows as one multi-row INSERT
+                    cursor.executemany("""
+                        INSERT INTO reading_streaks (user_id, date, pages_read)
+                        VALUES (%s, %s, %s)
+                        ON DUPLICATE KEY UPDATE pages_read = pages_read + VALUES(pages_read)
+                    """, streaks)
+            return True
+        except Error as e:
+            print(f"Error writing reading progress: {e}")
+            return False
+            
     def get_reading_streaks(self, user_id, year, month):
         """Get all reading streak dates for a user in a specific month"""
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        return self.get_reading_streaks_between(user_id, start, end)
+        
+    def get_reading_streaks_between(self, user_id, start, end):
+        """
+        Get reading streak dates for a user in any window (e.g. a whole year)
+        
+        Args:
+            user_id: User whose streaks to fetch
+            start: First date included
+            end: First date after the window (excluded)
+            
+        Returns:
+            List of {'date', 'pages_read'} rows ordered by date
+        """
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT date, pages_read FROM reading_streaks
-                WHERE user_id = %s 
-                AND YEAR(date) = %s 
-                AND MONTH(date) = %s
-            """, (user_id, year, month))
-            streaks = cursor.fetchall()
-            cursor.close()
-            return streaks
+            with self.cursor(dictionary=True) as cursor:
+                # A plain range on date is a seek on the (user_id, date) unique key
+                cursor.execute("""
+                    SELECT date, pages_read FROM reading_streaks
+                    WHERE user_id = %s
+                    AND date >= %s
+                    AND date < %s
+                    ORDER BY date
+                """, (user_id, start, end))
+                return cursor.fetchall()
         except Error as e:
             print(f"Error getting streaks: {e}")
             return []
@@ -339,17 +1070,19 @@ class Database:
     def remove_user_book(self, user_book_id):
         """Remove a book from user's collection"""
         try:
-            cursor = self.connection.cursor()
-            cursor.execute("DELETE FROM user_books WHERE id = %s", (user_book_id,))
-            self.connection.commit()
-            cursor.close()
+            with self.cursor() as cursor:
+                cursor.execute("DELETE FROM user_books WHERE id = %s", (user_book_id,))
             return True
         except Error as e:
             print(f"Error removing book: {e}")
             return False
             
     def close(self):
-        """Close database connection"""
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            print("Database connection closed")
\ No newline at end of file
+        """Close every pooled connection"""
+        with self.pool_lock:
+            if self.pool is None:
+                return
+            # Idle connections only; borrowed ones close when they are given back
+            self.pool._remove_connections()
+            self.pool = None
+        print("Database connection closed")
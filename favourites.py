@@ -5,10 +5,7 @@ Displays favourite books with covers in a grid layout.
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-from PIL import Image, ImageTk
-import requests
-from io import BytesIO
-import threading
+from cover_cache import GRID_COVER_SIZE
 
 class FavouritesFrame(tk.Frame):
     """Frame for displaying favourite books"""
@@ -18,6 +15,7 @@ class FavouritesFrame(tk.Frame):
     LIGHT_BROWN = "#8D6E63"
     ACCENT_BROWN = "#A1887F"
     CREAM = "#EFEBE9"
+    GRID_COLUMNS = 4
     
     def __init__(self, parent, app, user_id):
         super().__init__(parent, bg=self.CREAM)
@@ -27,6 +25,7 @@ class FavouritesFrame(tk.Frame):
         
         self.books = []
         self.book_images = {}
+        self.replace_cards = False
         
         self.create_widgets()
         self.load_books()
@@ -82,10 +81,36 @@ class FavouritesFrame(tk.Frame):
         canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
         
     def load_books(self):
-        """Load favourite books from database"""
-        self.books = self.app.db.get_user_books(self.user_id, 'favourite')
+        """Stream favourite books from database, drawing cards as batches arrive"""
+        self.replace_cards = True
+        self.app.async_db.stream(
+            self.app.db.iter_user_books, self.user_id, 'favourite',
+            on_batch=self.on_books_batch, on_done=self.on_books_loaded,
+            owner=self, key=(self.user_id, 'favourite')
+        )
+        
+    def on_books_batch(self, books):
+        """Add the cards of one streamed batch (the first batch replaces the old cards)"""
+        if self.replace_cards:
+            self.replace_cards = False
+            self.books = []
+            for widget in self.books_frame.winfo_children():
+                widget.destroy()
+                
+        start = len(self.books)
+        self.books.extend(books)
+        for index, book in enumerate(books, start):
+            row, col = divmod(index, self.GRID_COLUMNS)
+            self.create_book_card(book, row, col)
         self.count_label.config(text=f"{len(self.books)} books")
-        self.display_books()
+        
+    def on_books_loaded(self, count):
+        """Show the empty-shelf message if the stream had no books"""
+        if self.replace_cards:
+            self.replace_cards = False
+            self.books = []
+            self.count_label.config(text="0 books")
+            self.display_books()
         
     def display_books(self):
         """Display the books in a grid layout"""
@@ -105,7 +130,7 @@ class FavouritesFrame(tk.Frame):
         # Create grid of books
         row = 0
         col = 0
-        max_cols = 4
+        max_cols = self.GRID_COLUMNS
         
         for book in self.books:
             self.create_book_card(book, row, col)
@@ -141,26 +166,20 @@ class FavouritesFrame(tk.Frame):
         )
         cover_label.pack()
         
-        if book['cover_url']:
-            def load_image():
-                try:
-                    response = requests.get(book['cover_url'], timeout=5)
-                    img_data = response.content
-                    img = Image.open(BytesIO(img_data))
-                    img = img.resize((130, 180), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    self.book_images[book['book_id']] = photo
-                    cover_label.config(image=photo, text="")
-                except:
-                    pass
-            threading.Thread(target=load_image, daemon=True).start()
+        if book.cover_url:
+            def show_cover(photo):
+                self.book_images[book.book_id] = photo
+                cover_label.config(image=photo, text="")
+                
+            # Cards higher up the list are loaded first
+            self.app.image_loader.request(book.cover_url, GRID_COVER_SIZE, show_cover, row)
         
         # Book info
         info_frame = tk.Frame(card, bg=self.MEDIUM_BROWN)
         info_frame.pack(fill="x", padx=15)
         
         # Title (truncated)
-        title_text = book['title'][:50] + ('...' if len(book['title']) > 50 else '')
+        title_text = book.title[:50] + ('...' if len(book.title) > 50 else '')
         tk.Label(
             info_frame,
             text=title_text,
@@ -172,7 +191,7 @@ class FavouritesFrame(tk.Frame):
         ).pack(pady=(0, 5))
         
         # Author (truncated)
-        author_text = book['authors'][:40] + ('...' if len(book['authors']) > 40 else '')
+        author_text = book.authors[:40] + ('...' if len(book.authors) > 40 else '')
         tk.Label(
             info_frame,
             text=author_text,
@@ -184,10 +203,10 @@ class FavouritesFrame(tk.Frame):
         ).pack(pady=(0, 10))
         
         # Additional info
-        if book['page_count']:
+        if book.page_count:
             tk.Label(
                 info_frame,
-                text=f"{book['page_count']} pages",
+                text=f"{book.page_count} pages",
                 font=("Helvetica", 8),
                 bg=self.MEDIUM_BROWN,
                 fg=self.ACCENT_BROWN
@@ -221,7 +240,7 @@ class FavouritesFrame(tk.Frame):
             fg=self.CREAM,
             relief="flat",
             cursor="hand2",
-            command=lambda: self.remove_book(book['user_book_id']),
+            command=lambda: self.remove_book(book.user_book_id),
             padx=8,
             pady=5
         )
@@ -230,22 +249,30 @@ class FavouritesFrame(tk.Frame):
     def add_to_reading(self, book):
         """Add book to currently reading list"""
         # Add to currently reading (will create duplicate entry with different status)
-        if self.app.db.add_user_book(self.user_id, book['book_id'], 'currently_reading'):
-            messagebox.showinfo(
-                "Success",
-                f"'{book['title']}' added to Currently Reading!"
-            )
-        else:
-            messagebox.showinfo(
-                "Note",
-                "This book is already in your currently reading list!"
-            )
+        def added(success):
+            if success:
+                messagebox.showinfo(
+                    "Success",
+                    f"'{book.title}' added to Currently Reading!"
+                )
+            else:
+                messagebox.showinfo(
+                    "Note",
+                    "This book is already in your currently reading list!"
+                )
+                
+        self.app.async_db.add_user_book(
+            self.user_id, book.book_id, 'currently_reading', callback=added, owner=self
+        )
             
     def remove_book(self, user_book_id):
         """Remove book from favourites"""
         if messagebox.askyesno("Confirm", "Remove this book from favorites?"):
-            if self.app.db.remove_user_book(user_book_id):
-                messagebox.showinfo("Success", "Book removed from favorites!")
-                self.load_books()
-            else:
-                messagebox.showerror("Error", "Failed to remove book")
\ No newline at end of file
+            def removed(success):
+                if success:
+                    messagebox.showinfo("Success", "Book removed from favorites!")
+                    self.load_books()
+                else:
+                    messagebox.showerror("Error", "Failed to remove book")
+                    
+            self.app.async_db.remove_user_book(user_book_id, callback=removed, owner=self)
\ No newline at end of file
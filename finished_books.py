@@ -5,10 +5,7 @@ Displays finished books with covers and review functionality.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-from PIL import Image, ImageTk
-import requests
-from io import BytesIO
-import threading
+from cover_cache import GRID_COVER_SIZE
 from review_dialog import ReviewDialog
 
 class FinishedBooksFrame(tk.Frame):
@@ -18,6 +15,7 @@ class FinishedBooksFrame(tk.Frame):
     LIGHT_BROWN = "#8D6E63"
     ACCENT_BROWN = "#A1887F"
     CREAM = "#EFEBE9"
+    GRID_COLUMNS = 4
 
     def __init__(self, parent, app, user_id):
         super().__init__(parent, bg=self.CREAM)
@@ -26,7 +24,9 @@ class FinishedBooksFrame(tk.Frame):
         self.pack(fill="both", expand=True)
         
         self.books = []
+        self.reviews = {}  # book_id -> review row
         self.book_images = {}
+        self.replace_cards = False
         
         self.create_widgets()
         self.load_books()
@@ -82,10 +82,39 @@ class FinishedBooksFrame(tk.Frame):
         canvas.bind_all("<MouseWheel>", lambda e: canvas.yview_scroll(int(-1*(e.delta/120)), "units"))
         
     def load_books(self):
-        """Load finished books from database"""
-        self.books = self.app.db.get_user_books(self.user_id, 'finished')
+        """Stream finished books and their reviews from database, drawing cards as batches arrive"""
+        self.replace_cards = True
+        self.app.async_db.stream(
+            self.app.db.iter_finished_books_with_reviews, self.user_id,
+            on_batch=self.on_books_batch, on_done=self.on_books_loaded,
+            owner=self, key=(self.user_id, 'finished')
+        )
+        
+    def on_books_batch(self, shelf):
+        """Add the cards of one streamed batch (the first batch replaces the old cards)"""
+        if self.replace_cards:
+            self.replace_cards = False
+            self.books = []
+            self.reviews = {}
+            for widget in self.books_frame.winfo_children():
+                widget.destroy()
+                
+        start = len(self.books)
+        for index, (book, review) in enumerate(shelf, start):
+            self.books.append(book)
+            self.reviews[book.book_id] = review
+            row, col = divmod(index, self.GRID_COLUMNS)
+            self.create_book_card(book, row, col, review)
         self.count_label.config(text=f"{len(self.books)} books")
-        self.display_books()
+        
+    def on_books_loaded(self, count):
+        """Show the empty-shelf message if the stream had no books"""
+        if self.replace_cards:
+            self.replace_cards = False
+            self.books = []
+            self.reviews = {}
+            self.count_label.config(text="0 books")
+            self.display_books()
         
     def display_books(self):
         """Display the books in a grid layout"""
@@ -105,17 +134,17 @@ class FinishedBooksFrame(tk.Frame):
         # Create grid of books
         row = 0
         col = 0
-        max_cols = 4
+        max_cols = self.GRID_COLUMNS
         
         for book in self.books:
-            self.create_book_card(book, row, col)
+            self.create_book_card(book, row, col, self.reviews.get(book.book_id))
             col += 1
             if col >= max_cols:
                 col = 0
                 row += 1
                 
-    def create_book_card(self, book, row, col):
-        """Create a card widget for a finished book"""
+    def create_book_card(self, book, row, col, review=None):
+        """Create a card widget for a finished book (review is the user's review, if any)"""
         card = tk.Frame(self.books_frame, bg=self.MEDIUM_BROWN, relief="flat", width=200, height=350)
         card.grid(row=row, column=col, padx=10, pady=10, sticky="n")
         card.grid_propagate(False)
@@ -132,26 +161,20 @@ class FinishedBooksFrame(tk.Frame):
         )
         cover_label.pack()
         
-        if book['cover_url']:
-            def load_image():
-                try:
-                    response = requests.get(book['cover_url'], timeout=5)
-                    img_data = response.content
-                    img = Image.open(BytesIO(img_data))
-                    img = img.resize((130, 180), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    self.book_images[book['book_id']] = photo
-                    cover_label.config(image=photo, text="")
-                except:
-                    pass
-            threading.Thread(target=load_image, daemon=True).start()
+        if book.cover_url:
+            def show_cover(photo):
+                self.book_images[book.book_id] = photo
+                cover_label.config(image=photo, text="")
+                
+            # Cards higher up the list are loaded first
+            self.app.image_loader.request(book.cover_url, GRID_COVER_SIZE, show_cover, row)
         
         # Book info
         info_frame = tk.Frame(card, bg=self.MEDIUM_BROWN)
         info_frame.pack(fill="x", padx=15)
         
         # Title (truncated)
-        title_text = book['title'][:50] + ('...' if len(book['title']) > 50 else '')
+        title_text = book.title[:50] + ('...' if len(book.title) > 50 else '')
         tk.Label(
             info_frame,
             text=title_text,
@@ -163,7 +186,7 @@ class FinishedBooksFrame(tk.Frame):
         ).pack(pady=(0, 5))
         
         # Author (truncated)
-        author_text = book['authors'][:40] + ('...' if len(book['authors']) > 40 else '')
+        author_text = book.authors[:40] + ('...' if len(book.authors) > 40 else '')
         tk.Label(
             info_frame,
             text=author_text,
@@ -174,9 +197,6 @@ class FinishedBooksFrame(tk.Frame):
             justify="center"
         ).pack(pady=(0, 10))
         
-        # Check if book has a review
-        review = self.app.db.get_review(self.user_id, book['book_id'])
-        
         if review:
             # Display rating stars
             stars = "⭐" * review['rating']
@@ -192,9 +212,6 @@ class FinishedBooksFrame(tk.Frame):
         btn_frame = tk.Frame(card, bg=self.MEDIUM_BROWN)
         btn_frame.pack(side="bottom", pady=15)
         
-        # Check if book has a review
-        review = self.app.db.get_review(self.user_id, book['book_id'])
-        
         # Review button - Changes based on whether review exists
         if review:
             # Edit Review button (green when review exists)
@@ -251,7 +268,7 @@ class FinishedBooksFrame(tk.Frame):
             fg=self.CREAM,
             relief="flat",
             cursor="hand2",
-            command=lambda: self.remove_book(book['user_book_id']),
+            command=lambda: self.remove_book(book.user_book_id),
             padx=8,
             pady=5
         )
@@ -259,42 +276,48 @@ class FinishedBooksFrame(tk.Frame):
         
     def open_review_dialog(self, book):
         """Open dialog to add/edit book review"""
-        # Get existing review if any
-        existing_review = self.app.db.get_review(self.user_id, book['book_id'])
-        
-        dialog = ReviewDialog(
+        # Existing review if any (loaded with the shelf)
+        ReviewDialog(
             self,
             book,
-            existing_review,
+            self.reviews.get(book.book_id),
             self.save_review,
             self.delete_review
         )
         
-    def save_review(self, book_id, rating, review_text):
-        """Save book review to database"""
-        if self.app.db.add_review(self.user_id, book_id, rating, review_text):
-            messagebox.showinfo("Success", "Review saved successfully!")
-            self.load_books()  # Reload to show updated review
-            return True
-        else:
-            messagebox.showerror("Error", "Failed to save review")
-            return False
-        
-    def delete_review(self, book_id):
-        """Delete book review from database"""
-        if self.app.db.delete_review(self.user_id, book_id):
-            messagebox.showinfo("Success", "Review deleted successfully!")
-            self.load_books()  # Reload to remove review display
-            return True
-        else:
-            messagebox.showerror("Error", "Failed to delete review")
-            return False
+    def save_review(self, book_id, rating, review_text, on_saved=None):
+        """Save book review to database; on_saved() runs once it is stored"""
+        def saved(success):
+            if success:
+                messagebox.showinfo("Success", "Review saved successfully!")
+                if on_saved:
+                    on_saved()
+                self.load_books()  # Reload to show updated review
+            else:
+                messagebox.showerror("Error", "Failed to save review")
+                
+        self.app.async_db.add_review(
+            self.user_id, book_id, rating, review_text, callback=saved, owner=self
+        )
+        
+    def delete_review(self, book_id, on_deleted=None):
+        """Delete book review from database; on_deleted() runs once it is gone"""
+        def deleted(success):
+            if success:
+                messagebox.showinfo("Success", "Review deleted successfully!")
+                if on_deleted:
+                    on_deleted()
+                self.load_books()  # Reload to remove review display
+            else:
+                messagebox.showerror("Error", "Failed to delete review")
+                
+        self.app.async_db.delete_review(self.user_id, book_id, callback=deleted, owner=self)
         
     def view_review_details(self, book, review):
         """Display a popup with full review details"""
         # Create a new toplevel window
         detail_window = tk.Toplevel(self)
-        detail_window.title(f"Review: {book['title'][:40]}")
+        detail_window.title(f"Review: {book.title[:40]}")
         detail_window.geometry("450x650")
         detail_window.configure(bg="white")
         detail_window.resizable(False, False)
@@ -329,7 +352,7 @@ class FinishedBooksFrame(tk.Frame):
         # Book title
         tk.Label(
             content,
-            text=book['title'],
+            text=book.title,
             font=("Helvetica", 12, "bold"),
             bg="white",
             fg=self.DARK_BROWN,
@@ -339,7 +362,7 @@ class FinishedBooksFrame(tk.Frame):
         # Author
         tk.Label(
             content,
-            text=f"by {book['authors']}",
+            text=f"by {book.authors}",
             font=("Helvetica", 10),
             bg="white",
             fg=self.MEDIUM_BROWN
@@ -453,7 +476,7 @@ class FinishedBooksFrame(tk.Frame):
             fg=self.CREAM,
             relief="flat",
             cursor="hand2",
-            command=lambda: self.delete_from_detail_view(book['book_id'], detail_window),
+            command=lambda: self.delete_from_detail_view(book.book_id, detail_window),
             padx=20,
             pady=8
         )
@@ -480,14 +503,16 @@ class FinishedBooksFrame(tk.Frame):
 
     def delete_from_detail_view(self, book_id, detail_window):
         """Delete review from the detail view popup"""
-        if self.delete_review(book_id):
-            detail_window.destroy()
+        self.delete_review(book_id, detail_window.destroy)
             
     def remove_book(self, user_book_id):
         """Remove book from finished list"""
         if messagebox.askyesno("Confirm", "Remove this book from finished list?"):
-            if self.app.db.remove_user_book(user_book_id):
-                messagebox.showinfo("Success", "Book removed!")
-                self.load_books()
-            else:
-                messagebox.showerror("Error", "Failed to remove book")
\ No newline at end of file
+            def removed(success):
+                if success:
+                    messagebox.showinfo("Success", "Book removed!")
+                    self.load_books()
+                else:
+                    messagebox.showerror("Error", "Failed to remove book")
+                    
+            self.app.async_db.remove_user_book(user_book_id, callback=removed, owner=self)
\ No newline at end of file
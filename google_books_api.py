@@ -3,51 +3,208 @@ Google Books API Handler
 Manages all interactions with the Google Books API for searching books.
 """
 
+import json
+import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import quote
+from rate_limiter import TokenBucket, CircuitBreaker, backoff_delay
+from book import Book
+
+# Use a faster JSON decoder when one is installed
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        json_loads = ujson.loads
+    except ImportError:
+        json_loads = json.loads
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling the API while the circuit breaker is open"""
 
 class GoogleBooksAPI:
-    """Handles Google Books API requests"""
+    """Handles Google Books API requests over a pooled, keep-alive HTTP session"""
     
-    BASE_URL = "https://www.googleapis.com/books/v1/volumes"
+    # Override with GOOGLE_BOOKS_BASE_URL (or base_url=) to run against a local stand-in server
+    BASE_URL = os.environ.get("GOOGLE_BOOKS_BASE_URL", "https://www.googleapis.com/books/v1/volumes")
+    MAX_PAGE_SIZE = 40  # Largest maxResults the API accepts
     
-    @staticmethod
-    def search_books(query, max_results=20):
+    # Responses that mean "slow down / try again later"
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+    
+    # Partial-response projections (the API's fields= parameter) per use case.
+    # 'list' is what result cards and add_book need, 'detail' adds the links
+    # and 'full' downloads the whole volume resource.
+    FIELD_PROFILES = {
+        'list': 'id,volumeInfo(title,authors,description,imageLinks/thumbnail,'
+                'pageCount,publishedDate,categories)',
+        'detail': 'id,volumeInfo(title,authors,description,imageLinks/thumbnail,'
+                  'pageCount,publishedDate,categories,previewLink,infoLink)',
+        'full': None
+    }
+    
+    def __init__(self, pool_connections=4, pool_maxsize=8, max_retries=2,
+                 backoff_factor=0.3, timeout=10, cache=None, rate_limiter=None,
+                 circuit_breaker=None, max_backoff_attempts=4, base_url=None):
+        """
+        Create the client and its shared HTTP session
+        
+        Args:
+            pool_connections: Number of host pools to keep (API host, cover hosts, ...)
+            pool_maxsize: Maximum number of kept-alive connections per host
+            max_retries: Retries for failed connections (not for error responses, see _get_json)
+            backoff_factor: Backoff factor between retries, in seconds
+            timeout: Default request timeout in seconds
+            cache: Optional SearchCache for search results
+            rate_limiter: TokenBucket shared by all API requests (defaults to 5/s, burst 10)
+            circuit_breaker: CircuitBreaker guarding the API (defaults to 5 failures / 30 s)
+            max_backoff_attempts: Retries of a throttled (429/5xx) request before giving up
+            base_url: Volumes endpoint to use instead of BASE_URL
+        """
+        if base_url:
+            self.BASE_URL = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter or TokenBucket()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.max_backoff_attempts = max_backoff_attempts
+        self.session = requests.Session()
+        self.session.headers.update({'Connection': 'keep-alive'})
+        
+        # Connection errors only: throttled and 5xx responses are returned as they are
+        # and retried by _get_json through the rate limiter and circuit breaker
+        retry = Retry(
+            total=max_retries,
+            status=0,
+            backoff_factor=backoff_factor,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Payload accounting
+        self.stats_lock = threading.Lock()
+        self.requests_made = 0
+        self.bytes_received = 0
+        self.throttled_responses = 0
+        self.backoff_retries = 0
+    
+    def search_books(self, query, max_results=20, start_index=0, profile='list'):
         """
         Search for books using Google Books API
         
         Args:
             query: Search query string
-            max_results: Maximum number of results to return
+            max_results: Maximum number of results to return (one page, at most 40)
+            start_index: Position of the first result, for fetching later pages
+            profile: Key of FIELD_PROFILES selecting which fields to download
             
         Returns:
-            List of book dictionaries with relevant information
+            List of Book records
         """
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_key(query, max_results, start_index, profile)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return [Book.from_dict(book) for book in cached]
+                
         try:
-            # Encode query for URL
-            encoded_query = quote(query)
-            url = f"{GoogleBooksAPI.BASE_URL}?q={encoded_query}&maxResults={max_results}"
-            
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            data = self._get_json(self.build_search_url(query, max_results, start_index, profile))
+            books = GoogleBooksAPI.parse_search_response(data)
             
-            data = response.json()
-            
-            if 'items' not in data:
-                return []
+            if self.cache:
+                self.cache.put(cache_key, [book.to_dict() for book in books])
                 
-            books = []
-            for item in data['items']:
-                book_info = GoogleBooksAPI.parse_book_data(item)
-                if book_info:
-                    books.append(book_info)
-                    
             return books
             
         except requests.RequestException as e:
             print(f"Error searching books: {e}")
+            # Fall back to an expired cache entry while the API is unreachable or throttled
+            if self.cache:
+                stale = self.cache.get(cache_key, allow_stale=True)
+                if stale is not None:
+                    return [Book.from_dict(book) for book in stale]
             return []
             
+    def build_search_url(self, query, max_results=20, start_index=0, profile='list'):
+        """Build the volumes search URL for a query, page and field profile"""
+        # Encode query for URL
+        encoded_query = quote(query)
+        url = f"{self.BASE_URL}?q={encoded_query}&maxResults={max_results}"
+        if start_index:
+            url += f"&startIndex={start_index}"
+            
+        fields = self.FIELD_PROFILES[profile]
+        if fields:
+            url += f"&fields={quote(f'items({fields})', safe='(),/')}"
+        return url
+        
+    def build_volume_url(self, google_books_id, profile='detail'):
+        """Build the URL of a single volume for a field profile"""
+        url = f"{self.BASE_URL}/{quote(google_books_id)}"
+        fields = self.FIELD_PROFILES[profile]
+        if fields:
+            url += f"?fields={quote(fields, safe='(),/')}"
+        return url
+        
+    def iter_search(self, query, page_size=20, max_total=200):
+        """
+        Page through search results with startIndex, one request per page
+        
+        Args:
+            query: Search query string
+            page_size: Results requested per page (at most 40)
+            max_total: Stop after this many results
+            
+        Yields:
+            Book records, as soon as the page containing them arrives
+        """
+        page_size = min(page_size, self.MAX_PAGE_SIZE)
+        seen_ids = set()
+        start_index = 0
+        
+        while start_index < max_total:
+            page = self.search_books(query, page_size, start_index)
+            if not page:
+                return
+                
+            for book in page:
+                # Consecutive pages can overlap when the index shifts between requests
+                if book.google_books_id in seen_ids:
+                    continue
+                seen_ids.add(book.google_books_id)
+                yield book
+                
+            start_index += page_size
+            
+    @staticmethod
+    def parse_search_response(data):
+        """
+        Parse every item of a decoded search response
+        
+        Args:
+            data: Decoded JSON of a volumes search
+            
+        Returns:
+            List of Book records
+        """
+        parse = GoogleBooksAPI.parse_book_data
+        return [book for book in map(parse, data.get('items') or ()) if book]
+        
     @staticmethod
     def parse_book_data(item):
         """
@@ -57,66 +214,194 @@ class GoogleBooksAPI:
             item: Single book item from API response
             
         Returns:
-            Dictionary with formatted book information
+            Book record with formatted book information
         """
         try:
-            volume_info = item.get('volumeInfo', {})
+            volume_info = item.get('volumeInfo') or {}
+            get = volume_info.get
             
-            # Extract authors
-            authors = volume_info.get('authors', [])
-            authors_str = ', '.join(authors) if authors else 'Unknown Author'
+            authors = get('authors')
+            categories = get('categories')
             
-            # Extract categories
-            categories = volume_info.get('categories', [])
-            categories_str = ', '.join(categories) if categories else ''
-            
-            # Extract cover image
-            image_links = volume_info.get('imageLinks', {})
-            cover_url = image_links.get('thumbnail', '')
-            
-            # Use higher quality image if available
+            # Use a higher quality, https cover image if available
+            cover_url = (get('imageLinks') or {}).get('thumbnail', '')
             if cover_url:
-                cover_url = cover_url.replace('zoom=1', 'zoom=2')
-                cover_url = cover_url.replace('http://', 'https://')
-            
-            book_data = {
-                'google_books_id': item.get('id', ''),
-                'title': volume_info.get('title', 'Unknown Title'),
-                'authors': authors_str,
-                'description': volume_info.get('description', 'No description available'),
-                'cover_url': cover_url,
-                'page_count': volume_info.get('pageCount', 0),
-                'published_date': volume_info.get('publishedDate', ''),
-                'categories': categories_str,
-                'preview_link': volume_info.get('previewLink', ''),
-                'info_link': volume_info.get('infoLink', '')
-            }
+                if 'zoom=1' in cover_url:
+                    cover_url = cover_url.replace('zoom=1', 'zoom=2')
+                if cover_url.startswith('http://'):
+                    cover_url = 'https://' + cover_url[7:]
             
-            return book_data
+            return Book(
+                google_books_id=item.get('id', ''),
+                title=get('title', 'Unknown Title'),
+                authors=', '.join(authors) if authors else 'Unknown Author',
+                description=get('description', 'No description available'),
+                cover_url=cover_url,
+                page_count=get('pageCount', 0),
+                published_date=get('publishedDate', ''),
+                categories=', '.join(categories) if categories else '',
+                preview_link=get('previewLink', ''),
+                info_link=get('infoLink', '')
+            )
             
         except Exception as e:
             print(f"Error parsing book data: {e}")
             return None
             
-    @staticmethod
-    def get_book_by_id(google_books_id):
+    def get_book_by_id(self, google_books_id, profile='detail'):
         """
         Get detailed information for a specific book by its Google Books ID
         
         Args:
             google_books_id: The Google Books ID
+            profile: Key of FIELD_PROFILES selecting which fields to download
             
         Returns:
-            Dictionary with book information or None
+            Book record or None
         """
+        cache_key = None
+        if self.cache:
+            cache_key = self.cache.make_volume_key(google_books_id, profile)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return Book.from_dict(cached)
+                
         try:
-            url = f"{GoogleBooksAPI.BASE_URL}/{google_books_id}"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            return GoogleBooksAPI.parse_book_data(data)
+            data = self._get_json(self.build_volume_url(google_books_id, profile))
+            book = GoogleBooksAPI.parse_book_data(data)
+            if book and self.cache:
+                self.cache.put(cache_key, book.to_dict())
+            return book
             
         except requests.RequestException as e:
             print(f"Error getting book details: {e}")
-            return None
\ No newline at end of file
+            return None
+            
+    def download_image(self, url, timeout=5):
+        """
+        Download a cover image over the shared session
+        
+        Args:
+            url: Image URL
+            timeout: Request timeout in seconds
+            
+        Returns:
+            Raw image bytes
+        """
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.content
+        
+    def measure_field_savings(self, query, max_results=20, profile='list'):
+        """
+        Fetch one search page with and without a field projection and compare sizes
+        
+        Args:
+            query: Search query string
+            max_results: Page size
+            profile: Field profile to compare against the full payload
+            
+        Returns:
+            Dictionary with full/projected byte counts and the saving
+        """
+        full = self.session.get(self.build_search_url(query, max_results, 0, 'full'), timeout=self.timeout)
+        projected = self.session.get(self.build_search_url(query, max_results, 0, profile), timeout=self.timeout)
+        full.raise_for_status()
+        projected.raise_for_status()
+        
+        full_bytes = len(full.content)
+        projected_bytes = len(projected.content)
+        return {
+            'full_bytes': full_bytes,
+            'projected_bytes': projected_bytes,
+            'saved_bytes': full_bytes - projected_bytes,
+            'saved_percent': 100.0 * (full_bytes - projected_bytes) / full_bytes if full_bytes else 0.0
+        }
+        
+    def payload_stats(self):
+        """Return the number of API requests made and the JSON bytes received"""
+        with self.stats_lock:
+            return {
+                'requests': self.requests_made,
+                'bytes_received': self.bytes_received,
+                'average_bytes': self.bytes_received / self.requests_made if self.requests_made else 0
+            }
+        
+    def limiter_stats(self):
+        """Return rate limiter, backoff and circuit breaker metrics"""
+        with self.stats_lock:
+            backoff = {
+                'throttled_responses': self.throttled_responses,
+                'backoff_retries': self.backoff_retries
+            }
+        return {
+            'rate_limiter': self.rate_limiter.stats(),
+            'circuit_breaker': self.circuit_breaker.stats(),
+            'backoff': backoff
+        }
+        
+    def cache_stats(self):
+        """Return search cache hit/miss counters (empty when caching is off)"""
+        return self.cache.stats() if self.cache else {}
+        
+    def _get_json(self, url):
+        """
+        GET an API URL and decode its JSON body
+        
+        Requests are paced by the token bucket, throttled responses are retried
+        with jittered exponential backoff, and nothing is sent while the circuit
+        breaker is open.
+        """
+        for attempt in range(self.max_backoff_attempts + 1):
+            if not self.circuit_breaker.allow_request():
+                raise CircuitOpenError("Google Books API is temporarily unavailable")
+                
+            self.rate_limiter.acquire()
+            
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException:
+                self.circuit_breaker.record_failure()
+                raise
+                
+            with self.stats_lock:
+                self.requests_made += 1
+                self.bytes_received += len(response.content)
+                
+            if response.status_code not in self.RETRYABLE_STATUSES:
+                # Any other answer (a 404 included) shows the API is up
+                self.circuit_breaker.record_success()
+                break
+                
+            with self.stats_lock:
+                self.throttled_responses += 1
+                
+            if self.circuit_breaker.record_throttled():
+                break  # A throttled half-open trial reopens the circuit
+            if attempt == self.max_backoff_attempts:
+                self.circuit_breaker.record_failure()
+                break
+                
+            with self.stats_lock:
+                self.backoff_retries += 1
+            time.sleep(self._retry_after(response) or backoff_delay(attempt))
+            
+        response.raise_for_status()
+        try:
+            return json_loads(response.content)
+        except ValueError as e:
+            raise requests.RequestException(f"Invalid JSON from Google Books: {e}")
+        
+    @staticmethod
+    def _retry_after(response):
+        """Seconds requested by a Retry-After header, if the server sent one in that form"""
+        try:
+            return min(float(response.headers.get('Retry-After', '')), 60.0)
+        except ValueError:
+            return None
+        
+    def close(self):
+        """Close the HTTP session, its pooled connections and the cache"""
+        self.session.close()
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,141 @@
+"""
+Cover Image Loader
+Loads book covers on a small, bounded worker pool and delivers them to Tk widgets
+on the main thread.
+"""
+
+import heapq
+import itertools
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import ImageTk
+
+class ImageLoader:
+    """Prioritized, de-duplicating cover loader shared by all views"""
+
+    def __init__(self, covers, dispatcher, max_workers=4, max_photos=300):
+        """
+        Create the loader
+
+        Args:
+            covers: CoverCache used to fetch and decode thumbnails
+            dispatcher: MainThreadDispatcher used to hand results back to Tk
+            max_workers: Number of download/decode threads
+            max_photos: Number of Tk PhotoImages kept for instant reuse
+        """
+        self.covers = covers
+        self.dispatcher = dispatcher
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cover-loader")
+        self.max_photos = max_photos
+
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.pending = []    # heap of (priority, sequence, key)
+        self.waiters = {}    # key -> callbacks waiting for that cover
+        self.running = set()
+
+        # Only touched on the main thread
+        self.photos = OrderedDict()
+
+    def request(self, url, size, callback, priority=0):
+        """
+        Ask for a cover; must be called from the main thread
+
+        Args:
+            url: Cover image URL
+            size: (width, height) of the thumbnail
+            callback: Called on the main thread with the PhotoImage
+            priority: Lower values load first (e.g. the card's position on screen)
+        """
+        key = (url, tuple(size))
+
+        photo = self._cached_photo(key)
+        if photo is not None:
+            callback(photo)
+            return
+
+        with self.lock:
+            callbacks = self.waiters.get(key)
+            if callbacks is not None:
+                # Already queued or downloading - just wait for that result
+                callbacks.append(callback)
+                if key in self.running:
+                    return
+            else:
+                self.waiters[key] = [callback]
+            heapq.heappush(self.pending, (priority, next(self.counter), key))
+
+        self.executor.submit(self._work)
+
+    def clear_pending(self):
+        """Forget queued requests that haven't started (e.g. when the view changes)"""
+        with self.lock:
+            self.pending = []
+            for key in list(self.waiters):
+                if key not in self.running:
+                    del self.waiters[key]
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        self.clear_pending()
+        self.executor.shutdown(wait=False)
+
+    def _work(self):
+        """Worker: load the most urgent queued cover"""
+        with self.lock:
+            key = None
+            while self.pending:
+                _, _, candidate = heapq.heappop(self.pending)
+                if candidate in self.waiters and candidate not in self.running:
+                    key = candidate
+                    break
+            if key is None:
+                return
+            self.running.add(key)
+
+        try:
+            img = self.covers.get_thumbnail(key[0], key[1])
+        except Exception as e:
+            print(f"Error loading cover: {e}")
+            img = None
+
+        with self.lock:
+            self.running.discard(key)
+            callbacks = self.waiters.pop(key, [])
+
+        if img is not None and callbacks:
+            self.dispatcher.post(self._deliver, key, img, callbacks)
+
+    def _deliver(self, key, img, callbacks):
+        """Main thread: build the PhotoImage once and hand it to every waiter"""
+        photo = self._cached_photo(key)
+        if photo is None:
+            photo = ImageTk.PhotoImage(img)
+            self.photos[key] = photo
+            while len(self.photos) > self.max_photos:
+                self.photos.popitem(last=False)
+
+        for callback in callbacks:
+            try:
+                callback(photo)
+            except tk.TclError:
+                pass  # The card was destroyed before its cover arrived
+
+    def _cached_photo(self, key):
+        """Return a ready PhotoImage, building it from the memory cache if possible"""
+        photo = self.photos.get(key)
+        if photo is not None:
+            self.photos.move_to_end(key)
+            return photo
+
+        img = self.covers.peek(key[0], key[1])
+        if img is None:
+            return None
+
+        photo = ImageTk.PhotoImage(img)
+        self.photos[key] = photo
+        while len(self.photos) > self.max_photos:
+            self.photos.popitem(last=False)
+        return photo
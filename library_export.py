@@ -0,0 +1,144 @@
+"""
+Library Export
+Streams a user's shelves (books joined with their reviews) and reading streaks
+from unbuffered MySQL cursors straight into a gzip-compressed JSON Lines or CSV
+file, so memory use stays constant however large the library is.
+
+Usage: python library_export.py 42 my_library.jsonl.gz
+       python library_export.py 42 my_library.csv.gz --batch-size 1000
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import date, datetime
+
+# Columns of the CSV export; every JSON Lines record uses the same keys.
+# record_type is 'book' (a shelf entry) or 'streak' (a reading day).
+EXPORT_COLUMNS = (
+    'record_type', 'status', 'google_books_id', 'title', 'authors', 'description',
+    'cover_url', 'page_count', 'published_date', 'categories', 'current_page',
+    'date_added', 'date_finished', 'rating', 'review_text', 'reviewed_at',
+    'review_updated_at', 'date', 'pages_read'
+)
+
+
+def iter_export_records(db, user_id, batch_size=500):
+    """Yield export records: every shelf entry, then every reading streak day"""
+    for rows in db.iter_library_export(user_id, batch_size):
+        for row in rows:
+            yield dict(row, record_type='book')
+
+    for rows in db.iter_reading_streaks(user_id, batch_size):
+        for row in rows:
+            yield dict(row, record_type='streak')
+
+
+def export_library(db, user_id, path, file_format=None, batch_size=500, progress=None):
+    """
+    Write a user's library to a compressed export file
+
+    Args:
+        db: Database instance
+        user_id: Owner of the library
+        path: Output file; gzip-compressed when it ends in .gz
+        file_format: 'jsonl' or 'csv' (guessed from the file name if None)
+        batch_size: Rows read from MySQL per fetch
+        progress: Optional callable(records_written) called after every batch_size records
+
+    Returns:
+        Dictionary with counts of books and streaks written, elapsed seconds and rate
+
+    Raises:
+        mysql.connector.Error: If reading fails part way; the partial file is deleted
+    """
+    if file_format is None:
+        name = path[:-3] if path.endswith('.gz') else path
+        file_format = 'csv' if name.endswith('.csv') else 'jsonl'
+
+    started = time.perf_counter()
+    counts = {'book': 0, 'streak': 0}
+
+    opener = gzip.open if path.endswith('.gz') else open
+    try:
+        with opener(path, 'wt', encoding='utf-8', newline='') as f:
+            if file_format == 'csv':
+                writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+                writer.writeheader()
+                write = lambda record: writer.writerow({key: _csv_value(value) for key, value in record.items()})
+            else:
+                write = lambda record: f.write(json.dumps(record, default=_json_value) + '\n')
+
+            for record in iter_export_records(db, user_id, batch_size):
+                write(record)
+                counts[record['record_type']] += 1
+                written = counts['book'] + counts['streak']
+                if progress and written % batch_size == 0:
+                    progress(written)
+    except Exception:
+        # A truncated file must not pass for a complete backup
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+
+    seconds = time.perf_counter() - started
+    written = counts['book'] + counts['streak']
+    return {
+        'books': counts['book'],
+        'streaks': counts['streak'],
+        'seconds': seconds,
+        'rate': written / seconds if seconds else 0.0
+    }
+
+
+def _json_value(value):
+    """JSON encoding of values json can't write natively (dates)"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_value(value):
+    """CSV cell for a value (dates as ISO 8601, missing values empty)"""
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a MyBookieeee library")
+    parser.add_argument('user_id', type=int)
+    parser.add_argument('path', nargs='?', default=None,
+                        help="Output file (default: library_<user_id>.jsonl.gz)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default=None)
+    parser.add_argument('--batch-size', type=int, default=500, help="Rows per fetch")
+    args = parser.parse_args()
+
+    from database import Database
+
+    path = args.path or f"library_{args.user_id}.jsonl.gz"
+    db = Database()
+    if db.pool is None:
+        sys.exit("Could not connect to MySQL")
+    try:
+        stats = export_library(
+            db, args.user_id, path, args.format, args.batch_size,
+            progress=lambda written: print(f"\rWrote {written:,} records", end='', flush=True)
+        )
+    except Exception as e:
+        sys.exit(f"\nExport failed, nothing was written to {path}: {e}")
+    finally:
+        db.close()
+
+    print(f"\rExported {stats['books']:,} shelf entries and {stats['streaks']:,} reading days "
+          f"to {path} in {stats['seconds']:.1f}s ({stats['rate']:.0f} records/s)")
+
+
+if __name__ == "__main__":
+    main()
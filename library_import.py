@@ -0,0 +1,394 @@
+"""
+Library Import
+Streams a reading-list export (CSV such as a Goodreads export, a JSON array or
+JSON Lines), resolves each entry through the Google Books API with bounded
+concurrency and writes the books, shelf entries and reviews in batched
+transactions. The reading days of a library_export.py file are restored too.
+
+Usage: python library_import.py 42 goodreads_library_export.csv --workers 8 --batch-size 200
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from book import Book
+
+# Export shelf names mapped to user_books statuses
+STATUS_ALIASES = {
+    'read': 'finished',
+    'finished': 'finished',
+    'currently-reading': 'currently_reading',
+    'currently_reading': 'currently_reading',
+    'reading': 'currently_reading',
+    'to-read': 'currently_reading',
+    'favourite': 'favourite',
+    'favourites': 'favourite',
+    'favorite': 'favourite',
+    'favorites': 'favourite'
+}
+
+# Column names used by common exports for each field (matched case-insensitively)
+FIELD_ALIASES = {
+    'google_books_id': ('google_books_id', 'google books id', 'googlebooksid', 'gid'),
+    'isbn': ('isbn13', 'isbn', 'isbn_13', 'isbn10'),
+    'title': ('title', 'name'),
+    'author': ('author', 'authors', 'author l-f'),
+    'status': ('status', 'exclusive shelf', 'shelf'),
+    'date_added': ('date_added', 'date added', 'added'),
+    'date_finished': ('date_finished', 'date read', 'finished'),
+    'current_page': ('current_page',),
+    'rating': ('rating', 'my rating'),
+    'review_text': ('review_text', 'my review')
+}
+
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S')
+
+
+def read_records(path, file_format=None):
+    """
+    Stream the entries of an export file as dictionaries, one at a time
+
+    Args:
+        path: CSV, JSON (array of objects) or JSON Lines file, optionally
+            gzip-compressed (e.g. a library_export.py file ending in .jsonl.gz)
+        file_format: 'csv', 'json' or 'jsonl' (guessed from the extension if None)
+    """
+    compressed = path.lower().endswith('.gz')
+    if file_format is None:
+        name = path[:-3] if compressed else path
+        extension = os.path.splitext(name)[1].lower()
+        file_format = {'.json': 'json', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}.get(extension, 'csv')
+
+    opener = gzip.open if compressed else open
+    with opener(path, 'rt', newline='', encoding='utf-8-sig') as f:
+        if file_format == 'csv':
+            yield from csv.DictReader(f)
+        elif file_format == 'jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(f)
+
+
+def _iter_json_array(f, chunk_size=64 * 1024):
+    """Yield the items of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    eof = False
+
+    while True:
+        # Skip whitespace, the opening bracket and separating commas
+        stripped = buffer.lstrip()
+        if not started and stripped.startswith('['):
+            stripped = stripped[1:].lstrip()
+            started = True
+        if stripped.startswith(','):
+            stripped = stripped[1:].lstrip()
+        buffer = stripped
+
+        if started and buffer.startswith(']'):
+            return
+
+        if buffer and started:
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except ValueError:
+                if eof:
+                    raise
+            else:
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(buffer) or eof:
+                    yield item
+                    buffer = buffer[end:]
+                    continue
+
+        if eof:
+            if buffer.strip():
+                raise ValueError("Unexpected end of JSON array")
+            return
+
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def normalize_record(record, default_status='currently_reading'):
+    """
+    Pick the fields the importer needs out of one export entry
+
+    Returns:
+        Dictionary with google_books_id, isbn, title, author, status, date_added,
+        date_finished, current_page, rating (1-5) and review_text (missing values
+        are '' or None)
+    """
+    lowered = {str(key).strip().lower(): value for key, value in record.items()}
+
+    def field(name, quotes='="'):
+        for alias in FIELD_ALIASES[name]:
+            # Goodreads writes ISBNs as ="0123456789" to stop spreadsheets mangling them
+            value = str(lowered.get(alias) or '').strip().strip(quotes)
+            if value:
+                return value
+        return ''
+
+    status = STATUS_ALIASES.get(field('status').lower(), default_status)
+    rating = _parse_int(field('rating'))
+    return {
+        'google_books_id': field('google_books_id'),
+        'isbn': field('isbn'),
+        'title': field('title'),
+        'author': field('author'),
+        'status': status,
+        'date_added': _parse_date(field('date_added')),
+        'date_finished': _parse_date(field('date_finished')) if status == 'finished' else None,
+        'current_page': _parse_int(field('current_page')),
+        # Goodreads writes 0 for books without a rating
+        'rating': rating if rating and 1 <= rating <= 5 else None,
+        'review_text': field('review_text', quotes='') or None
+    }
+
+
+def normalize_streak(record):
+    """
+    Pick the day and pages read out of a 'streak' record of a library_export.py file
+
+    Returns:
+        (date, pages_read), or None if the record has no valid date
+    """
+    day = _parse_date(str(record.get('date') or '').strip())
+    if day is None:
+        return None
+    return day.date(), _parse_int(str(record.get('pages_read') or '')) or 0
+
+
+def _parse_date(value):
+    """Parse the date formats used by common exports (None if empty or unknown)"""
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_int(value):
+    """Parse a whole number such as '42' or '42.0' (None if empty or invalid)"""
+    try:
+        return int(float(value))
+    except (ValueError, OverflowError):
+        return None
+
+
+def resolve_book(api, record):
+    """
+    Find the Google Books volume of an entry: by ID, then ISBN, then title and author
+
+    Returns:
+        Book or None if nothing matched
+    """
+    if record['google_books_id']:
+        return api.get_book_by_id(record['google_books_id'])
+
+    if record['isbn']:
+        query = f"isbn:{record['isbn']}"
+    elif record['title']:
+        query = f"intitle:{record['title']}"
+        if record['author']:
+            query += f" inauthor:{record['author']}"
+    else:
+        return None
+
+    books = api.search_books(query, max_results=1)
+    return books[0] if books else None
+
+
+def import_library(db, api, user_id, path, file_format=None, default_status='currently_reading',
+                   max_workers=8, batch_size=200, progress=None):
+    """
+    Import an export file into a user's shelves, reviews and reading streaks
+
+    At most max_workers lookups run at once and only a few more entries are
+    read ahead, so memory stays flat however large the file is. Entries whose
+    google_books_id is already in the books table (e.g. a re-imported export)
+    are matched with one query per batch_size entries instead of an API call each.
+
+    Args:
+        db: Database instance
+        api: GoogleBooksAPI instance
+        user_id: Owner of the shelves
+        path: Export file (see read_records)
+        file_format: 'csv', 'json' or 'jsonl' (None to guess)
+        default_status: Status for entries without a recognised shelf
+        max_workers: Maximum concurrent Books API lookups
+        batch_size: Entries written per transaction
+        progress: Optional callable(stats) called after each written batch
+
+    Returns:
+        Dictionary with counts of entries read, resolved (already_stored of them
+        without the API), unresolved, duplicates, books added, shelf entries added,
+        reviews added, reading days written and failed writes, plus elapsed
+        seconds and rate
+    """
+    started = time.perf_counter()
+    stats = {
+        'read': 0, 'resolved': 0, 'already_stored': 0, 'unresolved': 0, 'duplicates': 0,
+        'books_added': 0, 'shelved': 0, 'reviewed': 0, 'reading_days': 0, 'failed': 0
+    }
+    seen = set()      # (google_books_id, status) already queued by this import
+    pending = []      # Entries waiting for the next batch write
+    in_flight = {}    # Lookup future -> normalized record
+    with_ids = []     # Records with a google_books_id waiting to be matched against the table
+    streaks = []      # (date, pages_read) waiting for the next batch write
+
+    def flush():
+        result = db.import_books_batch(user_id, pending)
+        if result is None:
+            stats['failed'] += len(pending)
+        else:
+            stats['books_added'] += result[0]
+            stats['shelved'] += result[1]
+            stats['reviewed'] += result[2]
+        pending.clear()
+        if progress:
+            progress(_with_timing(stats, started))
+
+    def flush_streaks():
+        written = db.import_reading_streaks(user_id, streaks)
+        if written is None:
+            stats['failed'] += len(streaks)
+        else:
+            stats['reading_days'] += written
+        streaks.clear()
+
+    def accept(record, book):
+        if not book or not book.google_books_id:
+            stats['unresolved'] += 1
+            return
+
+        stats['resolved'] += 1
+        key = (book.google_books_id, record['status'])
+        if key in seen:
+            stats['duplicates'] += 1
+            return
+        seen.add(key)
+        pending.append((book, record['status'], record['date_added'], record['date_finished'],
+                        record['current_page'], record['rating'], record['review_text']))
+        if len(pending) >= batch_size:
+            flush()
+
+    def collect(futures):
+        for future in futures:
+            record = in_flight.pop(future)
+            try:
+                book = future.result()
+            except Exception as e:
+                print(f"Error resolving '{record['title'] or record['isbn']}': {e}")
+                book = None
+            accept(record, book)
+
+    def look_up(executor, record):
+        in_flight[executor.submit(resolve_book, api, record)] = record
+
+        # Bounded read-ahead: wait for a lookup to finish before reading more
+        if len(in_flight) >= max_workers * 2:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    def match_stored(executor):
+        # Stored books only need their id; import_books_batch matches them on it
+        book_ids = db.get_book_ids({record['google_books_id'] for record in with_ids})
+        for record in with_ids:
+            book_id = book_ids.get(record['google_books_id'])
+            if book_id:
+                stats['already_stored'] += 1
+                accept(record, Book(record['google_books_id'], record['title'] or 'Unknown Title',
+                                    book_id=book_id))
+            else:
+                look_up(executor, record)
+        with_ids.clear()
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="import") as executor:
+        for raw in read_records(path, file_format):
+            if raw.get('record_type') == 'streak':
+                # Reading-day rows of a library_export.py file
+                streak = normalize_streak(raw)
+                if streak:
+                    streaks.append(streak)
+                    if len(streaks) >= batch_size:
+                        flush_streaks()
+                continue
+            stats['read'] += 1
+            record = normalize_record(raw, default_status)
+            if record['google_books_id']:
+                with_ids.append(record)
+                if len(with_ids) >= batch_size:
+                    match_stored(executor)
+            else:
+                look_up(executor, record)
+
+        if with_ids:
+            match_stored(executor)
+        collect(list(in_flight))
+
+    if pending:
+        flush()
+    if streaks:
+        flush_streaks()
+
+    return _with_timing(stats, started)
+
+
+def _with_timing(stats, started):
+    """Copy of the counters with elapsed seconds and entries read per second"""
+    seconds = time.perf_counter() - started
+    return dict(stats, seconds=seconds, rate=stats['read'] / seconds if seconds else 0.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a reading-list export into MyBookieeee")
+    parser.add_argument('user_id', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--format', choices=('csv', 'json', 'jsonl'), default=None)
+    parser.add_argument('--default-status', choices=('currently_reading', 'finished', 'favourite'),
+                        default='currently_reading')
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent Books API lookups")
+    parser.add_argument('--batch-size', type=int, default=200, help="Entries per transaction")
+    args = parser.parse_args()
+
+    from database import Database
+    from google_books_api import GoogleBooksAPI
+    from search_cache import SearchCache
+
+    def report(stats):
+        print(f"\rRead {stats['read']:,}  resolved {stats['resolved']:,}  "
+              f"shelved {stats['shelved']:,}  ({stats['rate']:.1f} entries/s)", end='', flush=True)
+
+    db = Database()
+    if db.pool is None:
+        sys.exit("Could not connect to MySQL")
+    api = GoogleBooksAPI(cache=SearchCache())
+    try:
+        stats = import_library(
+            db, api, args.user_id, args.path, args.format, args.default_status,
+            args.workers, args.batch_size, progress=report
+        )
+    finally:
+        api.close()
+        db.close()
+
+    print(f"\nImported {args.path} in {stats['seconds']:.1f}s ({stats['rate']:.1f} entries/s)")
+    for name in ('read', 'resolved', 'already_stored', 'unresolved', 'duplicates',
+                 'books_added', 'shelved', 'reviewed', 'reading_days', 'failed'):
+        print(f"  {name:<14} {stats[name]:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Library Metadata Refresh
+Re-fetches Google Books metadata for a user's whole library concurrently with
+AsyncGoogleBooksAPI and writes it back to the books table in batches.
+
+Usage: python library_refresh.py 42 --batch-size 100 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+async def refresh_library_metadata(db, api, user_id, batch_size=100, progress=None):
+    """
+    Refresh the stored metadata of every book in a user's collection
+
+    Lookups of a batch run concurrently (bounded by the client's concurrency);
+    the blocking database calls run on the loop's default executor.
+
+    Args:
+        db: Database instance
+        api: AsyncGoogleBooksAPI instance
+        user_id: Owner of the library
+        batch_size: Books looked up and written per transaction
+        progress: Optional callable(done, total) called after each batch (on the loop thread)
+
+    Returns:
+        Dictionary with counts of books looked up, updated and failed, and the elapsed time
+    """
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    google_ids = await loop.run_in_executor(None, db.get_library_google_ids, user_id)
+    total = len(google_ids)
+
+    done = updated = failed = 0
+    for offset in range(0, total, batch_size):
+        batch = google_ids[offset:offset + batch_size]
+        books = await api.get_books_by_ids(batch)
+        found = [book for book in books.values() if book]
+
+        done += len(batch)
+        failed += len(batch) - len(found)
+        if found:
+            updated += await loop.run_in_executor(None, db.update_books_metadata, found)
+
+        if progress:
+            progress(done, total)
+
+    return {
+        'looked_up': done,
+        'updated': updated,
+        'failed': failed,
+        'seconds': time.perf_counter() - started
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the Google Books metadata of a MyBookieeee library")
+    parser.add_argument('user_id', type=int)
+    parser.add_argument('--batch-size', type=int, default=100, help="Books per transaction")
+    parser.add_argument('--concurrency', type=int, default=8, help="Concurrent Books API lookups")
+    args = parser.parse_args()
+
+    from database import Database
+    from async_google_books_api import AsyncGoogleBooksAPI
+
+    async def run(db):
+        api = AsyncGoogleBooksAPI(concurrency=args.concurrency)
+        try:
+            return await refresh_library_metadata(
+                db, api, args.user_id, args.batch_size,
+                progress=lambda done, total: print(f"\rRefreshed {done:,}/{total:,} books", end='', flush=True)
+            )
+        finally:
+            await api.close()
+
+    db = Database()
+    if db.pool is None:
+        sys.exit("Could not connect to MySQL")
+    try:
+        stats = asyncio.run(run(db))
+    finally:
+        db.close()
+
+    print(f"\nLooked up {stats['looked_up']:,} books in {stats['seconds']:.1f}s: "
+          f"{stats['updated']:,} updated, {stats['failed']:,} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,21 @@ A comprehensive book tracking system with user authentication, Google Books API
 reading progress tracking, and reading streak calendar.
 """
 
+import sys
 import tkinter as tk
+from tkinter import messagebox
+from mysql.connector import Error
 from auth_page import AuthPage
 from database import Database
+from google_books_api import GoogleBooksAPI
+from search_cache import SearchCache
+from cover_cache import CoverCache
+from image_loader import ImageLoader
+from ui_dispatcher import MainThreadDispatcher, AsyncLoopThread
+from async_google_books_api import AsyncGoogleBooksAPI
+from search_scheduler import SearchScheduler
+from async_database import AsyncDatabase
+from write_behind import WriteBehindBuffer
 
 class BookTrackerApp:
     """Main application class that manages the window and navigation"""
@@ -21,8 +33,41 @@ class BookTrackerApp:
         # Center window on screen
         self.center_window()
         
-        # Initialize database
-        self.db = Database()
+        # Initialize database (a failed schema migration stops startup)
+        try:
+            self.db = Database(pool_size=5)
+        except Error as e:
+            messagebox.showerror("Database Error", f"Could not prepare the database:\n{e}")
+            self.root.destroy()
+            sys.exit(1)
+        
+        # Batches reading progress and streak writes (replays any left by a crash)
+        self.progress_writer = WriteBehindBuffer(self.db)
+        
+        # Shared Google Books client (pooled keep-alive session and cached searches)
+        self.books_api = GoogleBooksAPI(cache=SearchCache())
+        
+        # Process-wide cover cache shared by every view
+        self.covers = CoverCache(self.books_api.download_image)
+        
+        # Hands worker thread results back to the Tk event loop
+        self.dispatcher = MainThreadDispatcher(self.root)
+        
+        # Bounded worker pool for cover downloads
+        self.image_loader = ImageLoader(self.covers, self.dispatcher)
+        
+        # Background searches with stale-result cancellation
+        self.search_scheduler = SearchScheduler(self.books_api.search_books, self.dispatcher)
+        
+        # Views run their queries here so the window never waits on MySQL
+        self.async_db = AsyncDatabase(self.db, self.dispatcher, max_workers=4)
+        
+        # asyncio loop thread and client for concurrent fan-out (e.g. library refreshes)
+        self.async_loop = AsyncLoopThread(self.dispatcher)
+        self.async_books_api = AsyncGoogleBooksAPI(
+            rate_limiter=self.books_api.rate_limiter,
+            circuit_breaker=self.books_api.circuit_breaker
+        )
         
         # Store current user
         self.current_user = None
@@ -67,6 +112,15 @@ class BookTrackerApp:
     def run(self):
         """Start the application main loop"""
         self.root.mainloop()
+        self.dispatcher.stop()
+        self.image_loader.shutdown()
+        self.search_scheduler.shutdown()
+        self.async_loop.submit(self.async_books_api.close()).result(timeout=5)
+        self.async_loop.stop()
+        self.books_api.close()
+        self.async_db.shutdown()
+        self.progress_writer.close()
+        self.db.close()
 
 if __name__ == "__main__":
     app = BookTrackerApp()
@@ -4,11 +4,12 @@ Central hub with navigation and different views for book management.
 """
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 from search_books import SearchBooksFrame
 from reading_list import ReadingListFrame
 from finished_books import FinishedBooksFrame
 from favourites import FavouritesFrame
+from library_refresh import refresh_library_metadata
 
 class MainDashboard(tk.Frame):
 
@@ -99,6 +100,20 @@ class MainDashboard(tk.Frame):
         # Spacer
         tk.Frame(nav_frame, bg="#3E2723", height=50).pack()
         
+        # Re-fetch Google Books metadata for the whole library
+        self.refresh_btn = tk.Button(
+            nav_frame,
+            text="Refresh Library",
+            font=("Helvetica", 11),
+            bg="#3E2723",
+            fg=self.CREAM,
+            relief="flat",
+            cursor="hand2",
+            command=self.refresh_library,
+            pady=10
+        )
+        self.refresh_btn.pack(fill="x", pady=2)
+        
         # Logout button at bottom
         logout_btn = tk.Button(
             sidebar,
@@ -159,8 +174,37 @@ class MainDashboard(tk.Frame):
             else:
                 btn.config(bg=self.DARK_BROWN)
                 
+    def refresh_library(self):
+        """Refresh every book's metadata on the asyncio loop (concurrent lookups, bulk writes)"""
+        self.refresh_btn.config(state="disabled", text="Refreshing...")
+        
+        def finished(stats):
+            if not self.winfo_exists():
+                return
+            self.refresh_btn.config(state="normal", text="Refresh Library")
+            messagebox.showinfo(
+                "Library Refreshed",
+                f"Updated {stats['updated']} of {stats['looked_up']} books "
+                f"({stats['failed']} could not be fetched)."
+            )
+            
+        def failed(error):
+            if not self.winfo_exists():
+                return
+            self.refresh_btn.config(state="normal", text="Refresh Library")
+            messagebox.showerror("Error", f"Failed to refresh library: {error}")
+            
+        self.app.async_loop.submit(
+            refresh_library_metadata(self.app.db, self.app.async_books_api, self.user_id),
+            callback=finished,
+            errback=failed
+        )
+        
     def clear_content(self):
         """Clear the content area"""
+        # Covers queued for the old view are no longer needed
+        self.app.image_loader.clear_pending()
+        
         for widget in self.content_area.winfo_children():
             widget.destroy()
             
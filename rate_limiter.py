@@ -0,0 +1,196 @@
+"""
+Rate Limiting
+Token-bucket limiter, exponential backoff with jitter and a circuit breaker
+used by the Google Books client to stay within the API quota.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+class TokenBucket:
+    """Allows `rate` requests per second on average with bursts up to `capacity`"""
+
+    def __init__(self, rate=5.0, capacity=10):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+        self.acquired = 0
+        self.waits = 0
+        self.total_wait = 0.0
+
+    def acquire(self, timeout=None):
+        """
+        Take one token, sleeping until one is available
+
+        Args:
+            timeout: Maximum seconds to wait (None waits as long as needed)
+
+        Returns:
+            True if a token was taken, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+
+        while True:
+            delay = self._take(waited)
+            if not delay:
+                return True
+
+            if deadline is not None and time.monotonic() + delay > deadline:
+                return False
+
+            waited = True
+            time.sleep(delay)
+            with self.lock:
+                self.total_wait += delay
+
+    async def acquire_async(self):
+        """acquire() for coroutines: waits with asyncio.sleep instead of blocking the loop"""
+        waited = False
+
+        while True:
+            delay = self._take(waited)
+            if not delay:
+                return True
+
+            waited = True
+            await asyncio.sleep(delay)
+            with self.lock:
+                self.total_wait += delay
+
+    def _take(self, waited):
+        """Take a token if one is available; returns 0 on success, else seconds until one is"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.acquired += 1
+                if waited:
+                    self.waits += 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def stats(self):
+        """Return the limiter state"""
+        with self.lock:
+            self._refill()
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'tokens': round(self.tokens, 2),
+                'acquired': self.acquired,
+                'waits': self.waits,
+                'total_wait_seconds': round(self.total_wait, 3)
+            }
+
+    def _refill(self):
+        """Add the tokens earned since the last update (lock held)"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class CircuitBreaker:
+    """Stops calling a failing service for a while after repeated failures"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before one trial request
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_started_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def allow_request(self):
+        """True if a request may be sent now"""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return True
+
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                started = self.opened_at
+            else:
+                # A trial whose result was never recorded stops blocking after reset_timeout
+                started = self.trial_started_at
+            if now - started >= self.reset_timeout:
+                # Let a single trial request through; the rest wait for its result
+                self.state = self.HALF_OPEN
+                self.trial_started_at = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful request"""
+        with self.lock:
+            self.failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit past the threshold"""
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def record_throttled(self):
+        """
+        Note a throttled (429/5xx) answer that will be retried
+
+        The half-open trial can't retry (allow_request refuses it like any other
+        caller), so a throttled trial counts as a failed one and reopens the circuit.
+
+        Returns:
+            True if the circuit was reopened and the caller should stop retrying
+        """
+        with self.lock:
+            if self.state != self.HALF_OPEN:
+                return False
+            self.failures += 1
+            self._open()
+            return True
+
+    def is_open(self):
+        """True while requests are being refused (open, or half-open with a trial in flight)"""
+        with self.lock:
+            return self.state != self.CLOSED
+
+    def _open(self):
+        """Open the circuit (lock held)"""
+        if self.state != self.OPEN:
+            self.times_opened += 1
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+    def stats(self):
+        """Return the breaker state"""
+        with self.lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'times_opened': self.times_opened,
+                'rejected_requests': self.rejected
+            }
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """Exponential backoff with full jitter for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
@@ -4,7 +4,7 @@ Displays a calendar with highlighted reading streak days.
 """
 
 import tkinter as tk
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import calendar
 
 class ReadingCalendar(tk.Frame):
@@ -27,8 +27,9 @@ class ReadingCalendar(tk.Frame):
         self.current_year = now.year
         self.current_month = now.month
         
-        # Store streak dates
+        # Streak dates of the loaded year (one query covers every month of it)
         self.streak_dates = set()
+        self.loaded_year = None
         
         self.create_widgets()
         self.load_streaks()
@@ -235,24 +236,41 @@ class ReadingCalendar(tk.Frame):
                                      lambda e, d=date_str: self.toggle_streak(d))
                         
     def load_streaks(self):
-        """Load reading streaks from database"""
-        streaks = self.app.db.get_reading_streaks(
+        """Load the displayed year's reading streaks from database (in the background)"""
+        year = self.current_year
+        self.app.async_db.get_reading_streaks_between(
             self.user_id,
-            self.current_year,
-            self.current_month
+            date(year, 1, 1),
+            date(year + 1, 1, 1),
+            callback=lambda streaks: self.on_streaks_loaded(year, streaks),
+            owner=self,
+            key=(self.user_id, 'streaks')
         )
         
+    def on_streaks_loaded(self, year, streaks):
+        """Keep a year of streaks once the query returns and show the current month"""
+        if year != self.current_year:
+            return  # Navigated back to the loaded year while this one was in flight
+            
         self.streak_dates = set()
         for streak in streaks:
             date_str = streak['date'].strftime('%Y-%m-%d')
             self.streak_dates.add(date_str)
-            
+        # Days still waiting in the write-behind buffer
+        self.streak_dates |= self.app.progress_writer.pending_dates(self.user_id)
+        self.loaded_year = year
+        
+        self.show_month()
+        
+    def show_month(self):
+        """Update the stats and grid for the current month from the loaded year"""
         # Calculate current streak
         current_streak = self.calculate_current_streak()
         self.streak_label.config(text=f"Current Streak: {current_streak} days")
         
         # Total reading days
-        total_days = len(self.streak_dates)
+        month_prefix = f"{self.current_year}-{self.current_month:02d}-"
+        total_days = sum(1 for d in self.streak_dates if d.startswith(month_prefix))
         self.total_label.config(text=f"Total Days This Month: {total_days}")
         
         self.display_calendar()
@@ -273,6 +291,12 @@ class ReadingCalendar(tk.Frame):
             
         return streak
         
+    def mark_read(self, date_str):
+        """Show a reading day queued elsewhere (e.g. a progress update) without a reload"""
+        self.streak_dates.add(date_str)
+        if self.current_year == self.loaded_year:
+            self.show_month()
+            
     def toggle_streak(self, date_str):
         """Toggle reading streak for a date"""
         if date_str in self.streak_dates:
@@ -280,8 +304,11 @@ class ReadingCalendar(tk.Frame):
             pass
         else:
             # Add streak
-            self.app.db.add_reading_streak(self.user_id, date_str, 0)
-            self.load_streaks()
+            self.app.async_db.add_reading_streak(
+                self.user_id, date_str, 0,
+                callback=lambda success: self.load_streaks(),
+                owner=self
+            )
             
     def prev_month(self):
         """Go to previous month"""
@@ -289,7 +316,7 @@ class ReadingCalendar(tk.Frame):
         if self.current_month < 1:
             self.current_month = 12
             self.current_year -= 1
-        self.load_streaks()
+        self.change_month()
         
     def next_month(self):
         """Go to next month"""
@@ -297,4 +324,11 @@ class ReadingCalendar(tk.Frame):
         if self.current_month > 12:
             self.current_month = 1
             self.current_year += 1
-        self.load_streaks()
\ No newline at end of file
+        self.change_month()
+        
+    def change_month(self):
+        """Show the new month, querying only when it is in a year that isn't loaded"""
+        if self.current_year == self.loaded_year:
+            self.show_month()
+        else:
+            self.load_streaks()
\ No newline at end of file
@@ -5,10 +5,7 @@ Displays books currently being read with progress tracking and reading calendar.
 
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageTk
-import requests
-from io import BytesIO
-import threading
+from cover_cache import LIST_COVER_SIZE
 from datetime import datetime
 from reading_calendar import ReadingCalendar
 
@@ -29,6 +26,7 @@ class ReadingListFrame(tk.Frame):
         
         self.books = []
         self.book_images = {}
+        self.replace_cards = False
         
         self.create_widgets()
         self.load_books()
@@ -88,9 +86,37 @@ class ReadingListFrame(tk.Frame):
         self.calendar = ReadingCalendar(right_frame, self.app, self.user_id)
         
     def load_books(self):
-        """Load currently reading books from database"""
-        self.books = self.app.db.get_user_books(self.user_id, 'currently_reading')
-        self.display_books()
+        """Stream currently reading books from database, drawing cards as batches arrive"""
+        self.replace_cards = True
+        self.app.async_db.stream(
+            self.app.db.iter_user_books, self.user_id, 'currently_reading',
+            on_batch=self.on_books_batch, on_done=self.on_books_loaded,
+            owner=self, key=(self.user_id, 'currently_reading')
+        )
+        
+    def on_books_batch(self, books):
+        """Add the cards of one streamed batch (the first batch replaces the old cards)"""
+        if self.replace_cards:
+            self.replace_cards = False
+            self.books = []
+            for widget in self.books_frame.winfo_children():
+                widget.destroy()
+                
+        # Pages still waiting in the write-behind buffer are newer than the database's
+        for book in books:
+            book.current_page = self.app.progress_writer.pending_page(book.user_book_id, book.current_page)
+            
+        start = len(self.books)
+        self.books.extend(books)
+        for index, book in enumerate(books, start):
+            self.create_book_card(book, index)
+            
+    def on_books_loaded(self, count):
+        """Show the empty-shelf message if the stream had no books"""
+        if self.replace_cards:
+            self.replace_cards = False
+            self.books = []
+            self.display_books()
         
     def display_books(self):
         """Display the books in the frame"""
@@ -107,10 +133,10 @@ class ReadingListFrame(tk.Frame):
             ).pack(pady=50, padx=285)
             return
             
-        for book in self.books:
-            self.create_book_card(book)
+        for index, book in enumerate(self.books):
+            self.create_book_card(book, index)
             
-    def create_book_card(self, book):
+    def create_book_card(self, book, priority=0):
         """Create a detailed card for a currently reading book"""
         card = tk.Frame(self.books_frame, bg=self.MEDIUM_BROWN, relief="flat")
         card.pack(fill="x", padx=10, pady=10)
@@ -129,19 +155,13 @@ class ReadingListFrame(tk.Frame):
         cover_label = tk.Label(cover_frame, bg=self.MEDIUM_BROWN, text="📚", font=("Helvetica", 40))
         cover_label.pack()
         
-        if book['cover_url']:
-            def load_image():
-                try:
-                    response = requests.get(book['cover_url'], timeout=5)
-                    img_data = response.content
-                    img = Image.open(BytesIO(img_data))
-                    img = img.resize((100, 150), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    self.book_images[book['book_id']] = photo
-                    cover_label.config(image=photo, text="")
-                except:
-                    pass
-            threading.Thread(target=load_image, daemon=True).start()
+        if book.cover_url:
+            def show_cover(photo):
+                self.book_images[book.book_id] = photo
+                cover_label.config(image=photo, text="")
+                
+            # Cards higher up the list are loaded first
+            self.app.image_loader.request(book.cover_url, LIST_COVER_SIZE, show_cover, priority)
         
         # Book info
         info_frame = tk.Frame(top_section, bg=self.MEDIUM_BROWN)
@@ -149,7 +169,7 @@ class ReadingListFrame(tk.Frame):
         
         tk.Label(
             info_frame,
-            text=book['title'],
+            text=book.title,
             font=("Helvetica", 16, "bold"),
             bg=self.MEDIUM_BROWN,
             fg=self.CREAM,
@@ -159,17 +179,17 @@ class ReadingListFrame(tk.Frame):
         
         tk.Label(
             info_frame,
-            text=f"by {book['authors']}",
+            text=f"by {book.authors}",
             font=("Helvetica", 12),
             bg=self.MEDIUM_BROWN,
             fg=self.ACCENT_BROWN,
             anchor="w"
         ).pack(fill="x", pady=(5, 10))
         
-        if book['page_count']:
+        if book.page_count:
             tk.Label(
                 info_frame,
-                text=f"Total Pages: {book['page_count']}",
+                text=f"Total Pages: {book.page_count}",
                 font=("Helvetica", 10),
                 bg=self.MEDIUM_BROWN,
                 fg=self.ACCENT_BROWN,
@@ -181,8 +201,8 @@ class ReadingListFrame(tk.Frame):
         progress_section.pack(fill="x", pady=(15, 0))
 
         # Get initial values
-        current_page = book['current_page'] or 0
-        total_pages = book['page_count'] or 1
+        current_page = book.current_page or 0
+        total_pages = book.page_count or 1
         progress_pct = int((current_page / total_pages) * 100) if total_pages > 0 else 0
 
         # Progress label (will update dynamically)
@@ -240,7 +260,7 @@ class ReadingListFrame(tk.Frame):
             fg=self.CREAM,
             relief="flat",
             cursor="hand2",
-            command=lambda: self.update_progress(book['user_book_id'], progress_var.get(), book),
+            command=lambda: self.update_progress(book.user_book_id, progress_var.get(), book),
             padx=20,
             pady=5
         )
@@ -305,7 +325,7 @@ class ReadingListFrame(tk.Frame):
             fg=self.CREAM,
             relief="flat",
             cursor="hand2",
-            command=lambda: self.remove_book(book['user_book_id']),
+            command=lambda: self.remove_book(book.user_book_id),
             padx=15,
             pady=8
         )
@@ -317,51 +337,60 @@ class ReadingListFrame(tk.Frame):
         
     def update_progress(self, user_book_id, current_page, book):
         """Update reading progress and add to reading streak"""
-        if self.app.db.update_book_progress(user_book_id, current_page):
-            # Add today to reading streak
-            today = datetime.now().strftime('%Y-%m-%d')
-            self.app.db.add_reading_streak(self.user_id, today, 1)
-            
-            # Refresh calendar
-            self.calendar.load_streaks()
-            
-            # Show success message
-            tk.messagebox.showinfo("Success", f"Progress updated to page {current_page}!")
-            
-            # Reload books to show updated progress
-            self.load_books()
-        else:
-            tk.messagebox.showerror("Error", "Failed to update progress")
+        today = datetime.now().strftime('%Y-%m-%d')
+        
+        # Journaled now, written to MySQL with other pending updates in the next flush
+        self.app.progress_writer.queue_progress(user_book_id, current_page)
+        self.app.progress_writer.queue_streak(self.user_id, today, 1)
+        
+        # The card's slider and label already show the new page
+        book.current_page = current_page
+        self.calendar.mark_read(today)
+        
+        # Show success message
+        tk.messagebox.showinfo("Success", f"Progress updated to page {current_page}!")
             
     def mark_as_finished(self, book):
         """Move book to finished list"""
-        # Remove from currently reading
-        self.app.db.remove_user_book(book['user_book_id'])
-        
-        # Add to finished
-        self.app.db.add_user_book(self.user_id, book['book_id'], 'finished')
-        
-        tk.messagebox.showinfo("Success", f"'{book['title']}' moved to Finished Books!")
-        self.load_books()
+        def moved(success):
+            if success:
+                tk.messagebox.showinfo("Success", f"'{book.title}' moved to Finished Books!")
+            else:
+                tk.messagebox.showerror("Error", "Failed to move book")
+            self.load_books()
+            
+        # One transaction: the book is never on neither shelf
+        self.app.async_db.transition_book(
+            self.user_id, book.book_id, 'currently_reading', 'finished',
+            callback=moved, owner=self
+        )
         
     def remove_book(self, user_book_id):
         """Remove book from currently reading"""
         if tk.messagebox.askyesno("Confirm", "Remove this book from your reading list?"):
-            if self.app.db.remove_user_book(user_book_id):
-                tk.messagebox.showinfo("Success", "Book removed!")
-                self.load_books()
-            else:
-                tk.messagebox.showerror("Error", "Failed to remove book")
+            def removed(success):
+                if success:
+                    tk.messagebox.showinfo("Success", "Book removed!")
+                    self.load_books()
+                else:
+                    tk.messagebox.showerror("Error", "Failed to remove book")
+                    
+            self.app.async_db.remove_user_book(user_book_id, callback=removed, owner=self)
 
     def add_to_favourites(self, book):
         """Add book to favourites list"""
-        if self.app.db.add_user_book(self.user_id, book['book_id'], 'favourite'):
-            tk.messagebox.showinfo(
-                "Success",
-                f"'{book['title']}' added to Favourites!"
-            )
-        else:
-            tk.messagebox.showinfo(
-                "Note",
-                "This book is already in your favourites!"
-            )
\ No newline at end of file
+        def added(success):
+            if success:
+                tk.messagebox.showinfo(
+                    "Success",
+                    f"'{book.title}' added to Favourites!"
+                )
+            else:
+                tk.messagebox.showinfo(
+                    "Note",
+                    "This book is already in your favourites!"
+                )
+                
+        self.app.async_db.add_user_book(
+            self.user_id, book.book_id, 'favourite', callback=added, owner=self
+        )
\ No newline at end of file
@@ -21,7 +21,7 @@ class ReviewDialog(tk.Toplevel):
         self.selected_rating = existing_review['rating'] if existing_review else 0
         
         # Configure dialog
-        self.title(f"Review: {book['title'][:50]}")
+        self.title(f"Review: {book.title[:50]}")
         self.geometry("500x750")  # Increased height for delete button
         self.configure(bg="white")
         self.resizable(False, False)
@@ -67,7 +67,7 @@ class ReviewDialog(tk.Toplevel):
         # Book title
         tk.Label(
             content,
-            text=self.book['title'][:60] + ('...' if len(self.book['title']) > 60 else ''),
+            text=self.book.title[:60] + ('...' if len(self.book.title) > 60 else ''),
             font=("Helvetica", 12, "bold"),
             bg="white",
             fg=self.DARK_BROWN,
@@ -76,7 +76,7 @@ class ReviewDialog(tk.Toplevel):
         
         tk.Label(
             content,
-            text=f"by {self.book['authors']}",
+            text=f"by {self.book.authors}",
             font=("Helvetica", 10),
             bg="white",
             fg=self.MEDIUM_BROWN
@@ -266,15 +266,13 @@ class ReviewDialog(tk.Toplevel):
             if not result:
                 return
         
-        # Call the save callback
-        success = self.save_callback(
-            self.book['book_id'],
+        # Call the save callback; the dialog closes once the review is stored
+        self.save_callback(
+            self.book.book_id,
             self.selected_rating,
-            review_text
+            review_text,
+            self.destroy
         )
-        
-        if success:
-            self.destroy()
             
     def delete_review(self):
         """Delete the review"""
@@ -285,6 +283,4 @@ class ReviewDialog(tk.Toplevel):
         )
         
         if result and self.delete_callback:
-            success = self.delete_callback(self.book['book_id'])
-            if success:
-                self.destroy()
+            self.delete_callback(self.book.book_id, self.destroy)
@@ -5,11 +5,7 @@ Allows users to search for books using Google Books API and add them to their co
 
 import tkinter as tk
 from tkinter import messagebox, ttk
-from google_books_api import GoogleBooksAPI
-from PIL import Image, ImageTk
-import requests
-from io import BytesIO
-import threading
+from cover_cache import LIST_COVER_SIZE
 
 class SearchBooksFrame(tk.Frame):
     """Frame for searching and adding books"""  
@@ -19,6 +15,16 @@ class SearchBooksFrame(tk.Frame):
     ACCENT_BROWN = "#A1887F"
     CREAM = "#EFEBE9"
     WHITE = "#f5f5f5"
+    
+    # Search-as-you-type settings
+    DEBOUNCE_MS = 300
+    MIN_QUERY_LENGTH = 3
+    MAX_RECENT_QUERIES = 50
+    
+    # Paging settings
+    PAGE_SIZE = 20
+    MAX_TOTAL_RESULTS = 200
+    LOAD_MORE_THRESHOLD = 0.9  # Fraction scrolled before the next page is shown
 
     def __init__(self, parent, app, user_id):
         super().__init__(parent, bg=self.CREAM)
@@ -28,6 +34,16 @@ class SearchBooksFrame(tk.Frame):
         
         self.search_results = []
         self.book_images = {}  # Cache for book cover images
+        self.recent_results = {}  # Normalized query -> results, for prefix filtering
+        self.pending_search = None  # after() id of the debounced search
+        self.typed_query = None     # Normalized query last searched or scheduled
+        
+        # Paging state for the current search
+        self.current_query = None
+        self.next_start_index = 0
+        self.next_page = None  # Prefetched page, waiting to be shown
+        self.waiting_for_page = False
+        self.results_exhausted = True
         
         self.create_widgets()
         
@@ -62,6 +78,7 @@ class SearchBooksFrame(tk.Frame):
         )
         self.search_entry.pack(side="left", fill="x", expand=True, padx=20, pady=15, ipady=5)
         self.search_entry.bind("<Return>", lambda e: self.search_books())
+        self.search_entry.bind("<KeyRelease>", self.on_query_typed)
         
         search_btn = tk.Button(
             search_container,
@@ -77,6 +94,18 @@ class SearchBooksFrame(tk.Frame):
         )
         search_btn.pack(side="right", padx=20)
         
+        self.instant_search = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            search_container,
+            text="Search as you type",
+            variable=self.instant_search,
+            font=("Helvetica", 10),
+            bg="white",
+            fg="#2c3e50",
+            activebackground="white",
+            cursor="hand2"
+        ).pack(side="right")
+        
         # Results container with scrollbar
         results_container = tk.Frame(self, bg=self.LIGHT_BROWN)
         results_container.pack(fill="both", expand=True, padx=20, pady=(0, 20))
@@ -93,7 +122,7 @@ class SearchBooksFrame(tk.Frame):
         )
         
         canvas.create_window((0, 0), window=self.results_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        canvas.configure(yscrollcommand=lambda first, last: self.on_results_scroll(scrollbar, first, last))
        
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -125,15 +154,167 @@ class SearchBooksFrame(tk.Frame):
             messagebox.showwarning("Empty Search", "Please enter a search query")
             return
             
+        self.cancel_pending_search()
+        self.results_exhausted = True
         self.show_message("Searching...")
+        self.run_search(query)
+        
+    def run_search(self, query):
+        """Search in the background; results of superseded searches are dropped"""
+        self.pending_search = None
+        self.typed_query = self.normalize_query(query)
+        self.app.search_scheduler.submit(
+            query,
+            lambda results, q=query: self.show_search_results(results, q),
+            self.PAGE_SIZE
+        )
+        
+    def show_search_results(self, results, query):
+        """Receive the first page of the latest search on the main thread"""
+        if not self.winfo_exists():
+            return
+            
+        self.remember_results(query, results)
+        self.search_results = list(results)
+        self.display_results()
+        
+        # Start fetching the next page while the user looks at this one
+        self.current_query = query
+        self.next_start_index = self.PAGE_SIZE
+        self.results_exhausted = not results
+        self.prefetch_next_page()
+        
+    def on_results_scroll(self, scrollbar, first, last):
+        """Keep the scrollbar in sync and load more results near the bottom"""
+        scrollbar.set(first, last)
+        if float(last) >= self.LOAD_MORE_THRESHOLD and self.search_results:
+            self.load_more()
+            
+    def prefetch_next_page(self):
+        """Request the page after the ones already shown"""
+        if self.results_exhausted or self.next_start_index >= self.MAX_TOTAL_RESULTS:
+            return
+            
+        self.next_page = None
+        start_index = self.next_start_index
+        self.app.search_scheduler.submit_more(
+            self.current_query,
+            start_index,
+            lambda results, s=start_index: self.on_page_prefetched(results, s),
+            self.PAGE_SIZE
+        )
         
-        # Search in a separate thread to avoid blocking UI
-        def search_thread():
-            results = GoogleBooksAPI.search_books(query)
-            self.search_results = results
-            self.after(0, self.display_results)
+    def on_page_prefetched(self, results, start_index):
+        """Store a prefetched page, showing it right away if the user is already waiting"""
+        if not self.winfo_exists() or start_index != self.next_start_index:
+            return
+            
+        self.next_page = results
+        if self.waiting_for_page:
+            self.load_more()
             
-        threading.Thread(target=search_thread, daemon=True).start()
+    def load_more(self):
+        """Append the prefetched page to the results and prefetch the one after it"""
+        if self.results_exhausted or self.next_start_index >= self.MAX_TOTAL_RESULTS:
+            return
+            
+        if self.next_page is None:
+            self.waiting_for_page = True
+            return
+            
+        page = self.next_page
+        self.next_page = None
+        self.waiting_for_page = False
+        
+        if not page:
+            self.results_exhausted = True
+            return
+            
+        # Consecutive pages can overlap when the index shifts between requests
+        shown_ids = {book.google_books_id for book in self.search_results}
+        page = [book for book in page if book.google_books_id not in shown_ids]
+        
+        offset = len(self.search_results)
+        self.search_results.extend(page)
+        for index, book in enumerate(page):
+            self.create_book_card(book, offset + index)
+            
+        self.next_start_index += self.PAGE_SIZE
+        self.prefetch_next_page()
+        
+    def on_query_typed(self, event):
+        """Incremental search: filter known results now, query the API once typing pauses"""
+        if not self.instant_search.get() or event.keysym == "Return":
+            return
+            
+        query = self.search_entry.get().strip()
+        # Arrows, Shift, Ctrl+C, ... don't change the query: keep the loaded pages and scroll position
+        if self.normalize_query(query) == self.typed_query:
+            return
+            
+        self.cancel_pending_search()
+        if len(query) < self.MIN_QUERY_LENGTH:
+            self.typed_query = None
+            return
+        self.typed_query = self.normalize_query(query)
+            
+        # Narrow down results of an earlier, shorter query while the real search runs
+        local_results = self.filter_prefix_results(query)
+        if local_results:
+            # Locally filtered results have no further pages
+            self.results_exhausted = True
+            self.search_results = list(local_results)
+            self.display_results()
+            
+        self.pending_search = self.after(self.DEBOUNCE_MS, lambda: self.run_search(query))
+        
+    def cancel_pending_search(self):
+        """Cancel a debounced search that hasn't fired yet"""
+        if self.pending_search:
+            self.after_cancel(self.pending_search)
+            self.pending_search = None
+            
+    @staticmethod
+    def normalize_query(query):
+        """Lowercase a query and collapse its whitespace"""
+        return ' '.join(query.lower().split())
+        
+    def remember_results(self, query, results):
+        """Keep the results of a finished search for prefix filtering"""
+        self.recent_results.pop(self.normalize_query(query), None)
+        self.recent_results[self.normalize_query(query)] = results
+        while len(self.recent_results) > self.MAX_RECENT_QUERIES:
+            del self.recent_results[next(iter(self.recent_results))]
+            
+    def filter_prefix_results(self, query):
+        """
+        Filter the results of the longest remembered prefix of a query
+        
+        Args:
+            query: Query typed so far
+            
+        Returns:
+            List of matching books, or None if no prefix has been searched yet
+        """
+        normalized = self.normalize_query(query)
+        
+        best_prefix = None
+        for prefix in self.recent_results:
+            if normalized.startswith(prefix) and (best_prefix is None or len(prefix) > len(best_prefix)):
+                best_prefix = prefix
+                
+        if best_prefix is None:
+            return None
+            
+        results = self.recent_results[best_prefix]
+        if best_prefix == normalized:
+            return results
+            
+        terms = normalized.split()
+        return [
+            book for book in results
+            if all(term in f"{book.title} {book.authors}".lower() for term in terms)
+        ]
         
     def display_results(self):
         """Display search results"""
@@ -141,13 +322,16 @@ class SearchBooksFrame(tk.Frame):
             widget.destroy()
             
         if not self.search_results:
-            self.show_message("No books found. Try a different search.")
+            if self.app.books_api.circuit_breaker.is_open():
+                self.show_message("Google Books is busy right now. Please try again in a moment.")
+            else:
+                self.show_message("No books found. Try a different search.")
             return
             
-        for book in self.search_results:
-            self.create_book_card(book)
+        for index, book in enumerate(self.search_results):
+            self.create_book_card(book, index)
             
-    def create_book_card(self, book):
+    def create_book_card(self, book, priority=0):
         """Create a card widget for a book"""
         card = tk.Frame(self.results_frame, bg=self.MEDIUM_BROWN, relief="flat")
         card.pack(fill="x", pady=10, padx=10)
@@ -167,20 +351,13 @@ class SearchBooksFrame(tk.Frame):
         cover_label = tk.Label(cover_frame, bg=self.MEDIUM_BROWN, text="📚", font=("Helvetica", 40))
         cover_label.pack()
         
-        if book['cover_url']:
-            def load_image():
-                try:
-                    response = requests.get(book['cover_url'], timeout=5)
-                    img_data = response.content
-                    img = Image.open(BytesIO(img_data))
-                    img = img.resize((100, 150), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    self.book_images[book['google_books_id']] = photo
-                    cover_label.config(image=photo, text="")
-                except:
-                    pass
-                    
-            threading.Thread(target=load_image, daemon=True).start()
+        if book.cover_url:
+            def show_cover(photo):
+                self.book_images[book.google_books_id] = photo
+                cover_label.config(image=photo, text="")
+                
+            # Cards higher up the list are loaded first
+            self.app.image_loader.request(book.cover_url, LIST_COVER_SIZE, show_cover, priority)
         
         # Book info (middle)
         info_frame = tk.Frame(content, bg=self.MEDIUM_BROWN)
@@ -188,7 +365,7 @@ class SearchBooksFrame(tk.Frame):
         
         tk.Label(
             info_frame,
-            text=book['title'][:60] + ('...' if len(book['title']) > 60 else ''),
+            text=book.title[:60] + ('...' if len(book.title) > 60 else ''),
             font=("Helvetica", 14, "bold"),
             bg=self.MEDIUM_BROWN,
             fg=self.CREAM,
@@ -197,7 +374,7 @@ class SearchBooksFrame(tk.Frame):
         
         tk.Label(
             info_frame,
-            text=f"by {book['authors']}",
+            text=f"by {book.authors}",
             font=("Helvetica", 11),
             bg=self.MEDIUM_BROWN,
             fg=self.ACCENT_BROWN,
@@ -205,7 +382,7 @@ class SearchBooksFrame(tk.Frame):
         ).pack(fill="x", pady=(5, 10))
         
         # Description preview
-        desc = book['description'][:200] + ('...' if len(book['description']) > 200 else '')
+        desc = book.description[:200] + ('...' if len(book.description) > 200 else '')
         tk.Label(
             info_frame,
             text=desc,
@@ -219,12 +396,12 @@ class SearchBooksFrame(tk.Frame):
         
         # Additional info
         info_text = []
-        if book['page_count']:
-            info_text.append(f"{book['page_count']} pages")
-        if book['published_date']:
-            info_text.append(f"Published: {book['published_date'][:4]}")
-        if book['categories']:
-            info_text.append(book['categories'])
+        if book.page_count:
+            info_text.append(f"{book.page_count} pages")
+        if book.published_date:
+            info_text.append(f"Published: {book.published_date[:4]}")
+        if book.categories:
+            info_text.append(book.categories)
             
         if info_text:
             tk.Label(
@@ -295,11 +472,7 @@ class SearchBooksFrame(tk.Frame):
         
     def add_to_list(self, book, status):
         """Add a book to user's collection with specified status"""
-        # Add book to database
-        book_id = self.app.db.add_book(book)
-        
-        if book_id:
-            success = self.app.db.add_user_book(self.user_id, book_id, status)
+        def saved(success):
             if success:
                 status_names = {
                     'currently_reading': 'Currently Reading',
@@ -308,12 +481,13 @@ class SearchBooksFrame(tk.Frame):
                 }
                 messagebox.showinfo(
                     "Success",
-                    f"'{book['title']}' added to {status_names[status]}!"
+                    f"'{book.title}' added to {status_names[status]}!"
                 )
             else:
                 messagebox.showerror("Error", "Failed to add book to your collection")
-        else:
-            messagebox.showerror("Error", "Failed to save book information")
+                
+        # The book and the shelf entry are written in one transaction
+        self.app.async_db.shelve_book(self.user_id, book, status, callback=saved, owner=self)
 
     
     def create_tooltip(self, widget, text):
@@ -0,0 +1,181 @@
+"""
+Search Response Cache
+Two-tier cache (in-memory LRU + on-disk SQLite) for Google Books search results.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Per-user folder for the app's local caches
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".mybookieeee")
+
+class SearchCache:
+    """Caches parsed search results (and single volume lookups) by normalized request"""
+
+    def __init__(self, path=None, ttl=24 * 60 * 60, memory_size=128, max_entries=5000):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: SQLite file for the disk tier (defaults to CACHE_DIR/search_cache.db)
+            ttl: Seconds an entry stays fresh
+            memory_size: Maximum number of entries kept in the memory tier
+            max_entries: Maximum number of entries kept on disk
+        """
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+
+        self.memory = OrderedDict()  # key -> (stored_at, value)
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+
+        if path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            path = os.path.join(CACHE_DIR, "search_cache.db")
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS search_cache (
+                cache_key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_cache_accessed ON search_cache (accessed_at)"
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def make_key(query, max_results, start_index=0, profile='list'):
+        """Build a cache key from a search query (case and whitespace insensitive)"""
+        normalized = ' '.join(query.lower().split())
+        key = f"{normalized}|{max_results}"
+        if start_index:
+            key += f"|{start_index}"
+        if profile != 'list':
+            key += f"|{profile}"
+        return key
+
+    @staticmethod
+    def make_volume_key(google_books_id, profile='detail'):
+        """Build a cache key for a single volume lookup"""
+        return f"volume:{google_books_id}|{profile}"
+
+    def get(self, key, allow_stale=False):
+        """
+        Look up a cached value
+
+        Args:
+            key: Cache key from make_key()
+            allow_stale: Also return entries older than the TTL (used when the API is down)
+
+        Returns:
+            The cached value or None
+        """
+        now = time.time()
+
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry and (allow_stale or now - entry[0] < self.ttl):
+                self.memory.move_to_end(key)
+                self._record_hit(now - entry[0] >= self.ttl)
+                self.memory_hits += 1
+                return self._copy(entry[1])
+
+            row = self.connection.execute(
+                "SELECT value, stored_at FROM search_cache WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+
+            if row and (allow_stale or now - row[1] < self.ttl):
+                self.connection.execute(
+                    "UPDATE search_cache SET accessed_at = ? WHERE cache_key = ?",
+                    (now, key)
+                )
+                self.connection.commit()
+                value = json.loads(row[0])
+                self._remember(key, row[1], value)
+                self._record_hit(now - row[1] >= self.ttl)
+                self.disk_hits += 1
+                return self._copy(value)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store a value in both tiers, evicting the least recently used entries"""
+        now = time.time()
+
+        with self.lock:
+            self._remember(key, now, value)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO search_cache (cache_key, value, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now)
+            )
+            self.connection.execute("""
+                DELETE FROM search_cache WHERE cache_key IN (
+                    SELECT cache_key FROM search_cache
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self.connection.commit()
+
+    def clear(self):
+        """Remove every entry from both tiers"""
+        with self.lock:
+            self.memory.clear()
+            self.connection.execute("DELETE FROM search_cache")
+            self.connection.commit()
+
+    def stats(self):
+        """Return hit/miss counters"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'stale_hits': self.stale_hits,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self.memory)
+            }
+
+    def close(self):
+        """Close the disk tier"""
+        with self.lock:
+            self.connection.close()
+
+    def _remember(self, key, stored_at, value):
+        """Insert into the memory tier and trim it to memory_size"""
+        self.memory[key] = (stored_at, value)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def _record_hit(self, stale):
+        """Update hit counters"""
+        self.hits += 1
+        if stale:
+            self.stale_hits += 1
+
+    @staticmethod
+    def _copy(value):
+        """Hand out copies so callers can't modify cached book dicts"""
+        if isinstance(value, list):
+            return [dict(item) if isinstance(item, dict) else item for item in value]
+        return value
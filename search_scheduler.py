@@ -0,0 +1,130 @@
+"""
+Search Scheduler
+Runs Google Books searches in the background, merges identical in-flight
+searches and drops results that were superseded by a newer search.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from search_cache import SearchCache
+
+class SearchScheduler:
+    """Generation-tokened background search runner"""
+
+    def __init__(self, search_fn, dispatcher, max_workers=2):
+        """
+        Create the scheduler
+
+        Args:
+            search_fn: Callable (query, max_results, start_index) -> list of books
+            dispatcher: MainThreadDispatcher used to deliver results
+            max_workers: Number of searches allowed on the network at once
+        """
+        self.search_fn = search_fn
+        self.dispatcher = dispatcher
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search")
+
+        # Re-entrant: cancelling a Future runs its done callbacks immediately
+        self.lock = threading.RLock()
+        self.generation = 0
+        self.in_flight = {}  # query key -> Future
+
+    def submit(self, query, callback, max_results=20):
+        """
+        Start a search; only the most recent submission's callback ever runs
+
+        Args:
+            query: Search query string
+            callback: Called on the main thread with the list of books
+            max_results: Maximum number of results
+
+        Returns:
+            The generation token of this search
+        """
+        key = SearchCache.make_key(query, max_results)
+
+        with self.lock:
+            self.generation += 1
+            generation = self.generation
+
+            # Searches that are still queued are pointless now - never send them
+            for other_key, other in list(self.in_flight.items()):
+                if other_key != key and other.cancel():
+                    self.in_flight.pop(other_key, None)
+
+            future = self._start(key, query, max_results, 0)
+
+        future.add_done_callback(lambda f: self._finished(f, generation, callback))
+        return generation
+
+    def submit_more(self, query, start_index, callback, max_results=20):
+        """
+        Fetch a later page of the current search without superseding it
+
+        Args:
+            query: Search query string of the current search
+            start_index: Position of the first result of the page
+            callback: Called on the main thread with the page of books
+            max_results: Page size
+
+        Returns:
+            The generation token the page belongs to
+        """
+        key = SearchCache.make_key(query, max_results, start_index)
+
+        with self.lock:
+            generation = self.generation
+            future = self._start(key, query, max_results, start_index)
+
+        future.add_done_callback(lambda f: self._finished(f, generation, callback))
+        return generation
+
+    def is_current(self, generation):
+        """True if no newer search has been submitted since this generation"""
+        return generation == self.generation
+
+    def cancel(self):
+        """Invalidate every outstanding search and cancel the ones not yet started"""
+        with self.lock:
+            self.generation += 1
+            for key, future in list(self.in_flight.items()):
+                if future.cancel():
+                    self.in_flight.pop(key, None)
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        self.cancel()
+        self.executor.shutdown(wait=False)
+
+    def _start(self, key, query, max_results, start_index):
+        """Return the in-flight Future for a key, starting a request if there is none (lock held)"""
+        future = self.in_flight.get(key)
+        if future is None:
+            future = self.executor.submit(self.search_fn, query, max_results, start_index)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda f, k=key: self._forget(k, f))
+        return future
+
+    def _forget(self, key, future):
+        """Remove a finished search from the in-flight table"""
+        with self.lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def _finished(self, future, generation, callback):
+        """Worker side: pass fresh results on to the main thread"""
+        if future.cancelled() or not self.is_current(generation):
+            return
+
+        try:
+            results = future.result()
+        except Exception as e:
+            print(f"Error in background search: {e}")
+            results = []
+
+        self.dispatcher.post(self._deliver, generation, callback, results)
+
+    def _deliver(self, generation, callback, results):
+        """Main thread: re-check the token, since a newer search may have started meanwhile"""
+        if self.is_current(generation):
+            callback(results)
@@ -0,0 +1,101 @@
+"""
+Pooled Transactions
+Every borrow through Database.cursor() must end in a commit or a rollback,
+since the pool doesn't reset sessions. Runs on a stub pool that records calls.
+"""
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+import database
+
+
+class RecordingCursor:
+    def __init__(self, log, rows):
+        self.log = log
+        self.rows = list(rows)
+
+    def execute(self, operation, params=None):
+        self.log.append('execute')
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class RecordingConnection:
+    def __init__(self, log, rows):
+        self.log = log
+        self.rows = rows
+
+    def cursor(self, dictionary=False, buffered=True):
+        return RecordingCursor(self.log, self.rows)
+
+    def ping(self, **kwargs):
+        pass
+
+    def commit(self):
+        self.log.append('commit')
+
+    def rollback(self):
+        self.log.append('rollback')
+
+    def close(self):
+        self.log.append('returned')
+
+
+@pytest.fixture
+def log():
+    return []
+
+
+@pytest.fixture
+def db(monkeypatch, log):
+    rows = [{'n': n} for n in range(10)]
+
+    class Pool:
+        def get_connection(self):
+            return RecordingConnection(log, rows)
+
+        def _remove_connections(self):
+            pass
+
+    monkeypatch.setattr(database, "MySQLConnectionPool", lambda **config: Pool())
+    monkeypatch.setattr(database.Database, "create_tables", lambda self: None)
+    db = database.Database(pool_size=2)
+    yield db
+    db.close()
+
+
+def test_block_that_finishes_commits(db, log):
+    with db.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    assert log == ['execute', 'commit', 'returned']
+
+
+def test_block_that_raises_rolls_back(db, log):
+    with pytest.raises(ValueError):
+        with db.cursor() as cursor:
+            raise ValueError("boom")
+    assert log == ['rollback', 'returned']
+
+
+def test_stream_closed_early_rolls_back(db, log):
+    stream = db._stream("SELECT n FROM t", (), batch_size=3)
+    assert len(next(stream)) == 3
+    stream.close()  # What AsyncDatabase.stream does when a newer reload replaces it
+    assert log == ['execute', 'rollback', 'returned']
+
+
+def test_stream_read_to_the_end_commits(db, log):
+    batches = list(db._stream("SELECT n FROM t", (), batch_size=4))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert log == ['execute', 'commit', 'returned']
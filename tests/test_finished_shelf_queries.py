@@ -0,0 +1,110 @@
+"""
+Finished Shelf Query Count
+Guards against the finished shelf going back to one review query per book.
+Runs on a stub connection pool, so no MySQL server is needed.
+"""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+import database
+
+
+def finished_row(book_id, reviewed):
+    """A FINISHED_QUERY row as a dictionary cursor returns it"""
+    return {
+        'book_id': book_id, 'google_books_id': f"gid{book_id}", 'title': f"Book {book_id}",
+        'authors': "Some Author", 'cover_url': "", 'page_count': 300,
+        'published_date': "2020", 'categories': "Fiction", 'current_page': 300,
+        'date_added': datetime(2024, 1, book_id), 'date_finished': datetime(2024, 2, book_id),
+        'user_book_id': 100 + book_id,
+        'review_id': 500 + book_id if reviewed else None,
+        'rating': 4 if reviewed else None,
+        'review_text': "Loved it" if reviewed else None,
+        'created_at': datetime(2024, 3, 1) if reviewed else None,
+        'updated_at': datetime(2024, 3, 1) if reviewed else None
+    }
+
+
+class StubCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.position = 0
+
+    def execute(self, operation, params=None):
+        self.position = 0
+
+    def fetchall(self):
+        rows, self.position = self.rows[self.position:], len(self.rows)
+        return rows
+
+    def fetchmany(self, size):
+        rows = self.rows[self.position:self.position + size]
+        self.position += len(rows)
+        return rows
+
+    def close(self):
+        pass
+
+
+class StubConnection:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def cursor(self, dictionary=False, buffered=True):
+        return StubCursor(self.rows)
+
+    def ping(self, **kwargs):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class StubPool:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_connection(self):
+        return StubConnection(self.rows)
+
+    def _remove_connections(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    rows = [finished_row(book_id, reviewed=book_id % 2 == 0) for book_id in range(1, 26)]
+    monkeypatch.setattr(database, "MySQLConnectionPool", lambda **config: StubPool(rows))
+    monkeypatch.setattr(database.Database, "create_tables", lambda self: None)
+    db = database.Database(pool_size=2)
+    yield db
+    db.close()
+
+
+def test_finished_shelf_is_one_query(db):
+    with db.count_queries() as counter:
+        books = db.get_finished_books_with_reviews(1)
+
+    assert counter.count == 1, counter.statements
+    assert len(books) == 25
+    reviewed = [review for book, review in books if review]
+    assert len(reviewed) == 12
+    assert reviewed[0]['rating'] == 4
+
+
+def test_streamed_finished_shelf_is_one_query(db):
+    with db.count_queries() as counter:
+        batches = list(db.iter_finished_books_with_reviews(1, batch_size=10))
+
+    assert counter.count == 1, counter.statements
+    assert [len(batch) for batch in batches] == [10, 10, 5]
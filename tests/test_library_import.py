@@ -0,0 +1,72 @@
+"""
+Library Import
+An export written by library_export.py imports back with its shelves, pages,
+reviews and reading days, against fake databases instead of MySQL.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from library_export import export_library
+from library_import import import_library, normalize_record
+
+
+class ExportingDatabase:
+    """Serves one shelf entry and one reading day to export_library"""
+
+    def iter_library_export(self, user_id, batch_size=500):
+        yield [{
+            'status': 'finished', 'current_page': 212, 'date_added': datetime(2026, 9, 1, 8, 30),
+            'date_finished': datetime(2026, 10, 2, 21, 0), 'google_books_id': 'abc123',
+            'title': 'Dune', 'authors': 'Frank Herbert', 'description': None, 'cover_url': None,
+            'page_count': 412, 'published_date': '1965', 'categories': 'Fiction',
+            'rating': 5, 'review_text': 'He said "the spice must flow"',
+            'reviewed_at': datetime(2026, 10, 3), 'review_updated_at': datetime(2026, 10, 3)
+        }]
+
+    def iter_reading_streaks(self, user_id, batch_size=500):
+        yield [{'date': date(2026, 10, 2), 'pages_read': 40}]
+
+
+class ImportingDatabase:
+    """Knows the exported book already and records what import_library writes"""
+
+    def __init__(self):
+        self.entries = []
+        self.streaks = []
+
+    def get_book_ids(self, google_ids):
+        return {google_id: 1 for google_id in google_ids if google_id == 'abc123'}
+
+    def import_books_batch(self, user_id, entries):
+        self.entries.extend(entries)
+        return 0, len(entries), sum(1 for entry in entries if entry[5] or entry[6])
+
+    def import_reading_streaks(self, user_id, streaks):
+        self.streaks.extend(streaks)
+        return len(streaks)
+
+
+@pytest.mark.parametrize("name", ["library.jsonl.gz", "library.csv.gz"])
+def test_export_imports_again(tmp_path, name):
+    path = str(tmp_path / name)
+    export_library(ExportingDatabase(), 42, path)
+
+    db = ImportingDatabase()
+    stats = import_library(db, api=None, user_id=42, path=path)
+
+    assert (stats['already_stored'], stats['shelved'], stats['reviewed'], stats['reading_days']) == (1, 1, 1, 1)
+    book, status, date_added, date_finished, current_page, rating, review_text = db.entries[0]
+    assert (book.book_id, status, current_page, rating) == (1, 'finished', 212, 5)
+    assert review_text == 'He said "the spice must flow"'
+    assert (date_added, date_finished) == (datetime(2026, 9, 1, 8, 30), datetime(2026, 10, 2, 21, 0))
+    assert db.streaks == [(date(2026, 10, 2), 40)]
+
+
+def test_goodreads_zero_rating_means_unrated():
+    record = normalize_record({'Title': 'Dune', 'ISBN': '="0441013597"', 'My Rating': '0',
+                               'Exclusive Shelf': 'read'})
+    assert record['isbn'] == '0441013597'
+    assert record['rating'] is None
+    assert record['status'] == 'finished'
@@ -0,0 +1,74 @@
+"""
+Schema Migrations
+A migration that fails must stop startup instead of leaving the app running
+without the unique keys it relies on. Runs on a stub pool.
+"""
+
+import pytest
+
+pytest.importorskip("mysql.connector")
+
+import database
+
+
+class MigratingCursor:
+    def __init__(self, log, applied):
+        self.log = log
+        self.applied = applied
+
+    def execute(self, operation, params=None):
+        if operation.startswith("ALTER TABLE books"):
+            raise database.Error("ALTER command denied to user")
+        if operation.startswith("INSERT INTO schema_migrations"):
+            self.log.append(params[0])
+
+    def fetchall(self):
+        return [(version,) for version in self.applied]
+
+    def close(self):
+        pass
+
+
+def stub_pool(monkeypatch, log, applied):
+    class Connection:
+        def cursor(self, dictionary=False, buffered=True):
+            return MigratingCursor(log, applied)
+
+        def ping(self, **kwargs):
+            pass
+
+        def commit(self):
+            pass
+
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    class Pool:
+        def get_connection(self):
+            return Connection()
+
+        def _remove_connections(self):
+            pass
+
+    monkeypatch.setattr(database, "MySQLConnectionPool", lambda **config: Pool())
+
+
+def test_failed_migration_stops_startup(monkeypatch):
+    recorded = []
+    stub_pool(monkeypatch, recorded, applied=[])
+
+    with pytest.raises(database.Error):
+        database.Database(pool_size=1)
+    assert recorded == []
+
+
+def test_applied_migrations_are_skipped(monkeypatch):
+    recorded = []
+    stub_pool(monkeypatch, recorded, applied=[version for version, _ in database.MIGRATIONS])
+
+    db = database.Database(pool_size=1)
+    assert recorded == []
+    db.close()
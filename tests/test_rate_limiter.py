@@ -0,0 +1,48 @@
+"""
+Circuit Breaker
+Half-open behaviour of CircuitBreaker: one trial at a time, and a trial that
+is throttled or fails opens the circuit again.
+"""
+
+import time
+
+from rate_limiter import CircuitBreaker
+
+
+def opened_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    return breaker
+
+
+def test_half_open_lets_a_single_trial_through():
+    breaker = opened_breaker()
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    assert breaker.is_open()
+
+    breaker.record_success()
+    assert breaker.allow_request()
+    assert not breaker.is_open()
+
+
+def test_throttled_trial_reopens_the_circuit():
+    breaker = opened_breaker()
+    assert breaker.allow_request()
+    assert breaker.record_throttled()
+    assert breaker.stats()['state'] == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_throttling_while_closed_only_retries():
+    breaker = CircuitBreaker(failure_threshold=1)
+    assert not breaker.record_throttled()
+    assert breaker.stats()['state'] == CircuitBreaker.CLOSED
+
+
+def test_trial_without_a_result_expires():
+    breaker = opened_breaker()
+    assert breaker.allow_request()
+    time.sleep(0.06)
+    assert breaker.allow_request()
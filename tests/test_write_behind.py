@@ -0,0 +1,145 @@
+"""
+Write-Behind Buffer
+Crash recovery, failed flushes and the size trigger of WriteBehindBuffer,
+against a fake database that records each batch instead of writing to MySQL.
+"""
+
+import json
+import threading
+
+import pytest
+
+from write_behind import WriteBehindBuffer
+
+
+class FakeDatabase:
+    """Records write_progress_batch calls; fails while ok is False"""
+
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.batches = []
+        self.during_write = None  # Called inside the write, e.g. to queue more updates
+        self.written = threading.Event()
+
+    def write_progress_batch(self, progress, streaks):
+        if self.during_write:
+            self.during_write()
+        self.batches.append((sorted(progress), sorted(streaks)))
+        self.written.set()
+        return self.ok
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / "progress_journal.jsonl")
+
+
+def open_buffer(db, journal, **kwargs):
+    # A long interval keeps the timer out of the way; tests flush explicitly
+    kwargs.setdefault('flush_interval', 60)
+    return WriteBehindBuffer(db, journal, **kwargs)
+
+
+def journal_entries(journal):
+    with open(journal, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_updates_are_coalesced_into_one_batch(journal):
+    db = FakeDatabase()
+    buffer = open_buffer(db, journal)
+    buffer.queue_progress(7, 10)
+    buffer.queue_progress(7, 25)
+    buffer.queue_streak(1, '2026-10-17', 1)
+    buffer.queue_streak(1, '2026-10-17', 1)
+
+    assert buffer.flush()
+    assert db.batches == [([(25, 7)], [(1, '2026-10-17', 2)])]
+    assert journal_entries(journal) == []
+    buffer.close()
+
+
+def test_abandoned_journal_with_torn_line_is_replayed(journal):
+    crashed = open_buffer(FakeDatabase(), journal)
+    crashed.queue_progress(7, 10)
+    crashed.queue_progress(7, 25)
+    crashed.queue_streak(1, '2026-10-17', 1)
+    crashed.queue_streak(1, '2026-10-17', 1)
+    crashed.sync()
+    # The process dies mid-write: no flush, no close, half a line at the end
+    crashed.stopped = True
+    with open(journal, 'a', encoding='utf-8') as f:
+        f.write('{"op": "progress", "user_book_id": 9, "curr')
+
+    db = FakeDatabase()
+    buffer = open_buffer(db, journal)
+    assert buffer.pending_page(7) == 25
+    assert buffer.pending_page(9) is None
+    assert buffer.pending_dates(1) == {'2026-10-17'}
+
+    # Replayed writes are flushed straight away, without waiting for the timer
+    assert db.written.wait(5)
+    assert db.batches[0] == ([(25, 7)], [(1, '2026-10-17', 2)])
+    buffer.close()
+    assert journal_entries(journal) == []
+
+
+def test_entry_after_a_torn_line_survives_another_crash(journal):
+    with open(journal, 'w', encoding='utf-8') as f:
+        f.write('{"op": "progress", "user_book_id": 9, "curr')
+
+    crashed = open_buffer(FakeDatabase(ok=False), journal)
+    crashed.queue_progress(7, 40)
+    crashed.sync()
+    crashed.stopped = True  # Dies again before a flush gets through
+
+    buffer = open_buffer(FakeDatabase(ok=False), journal)
+    assert buffer.pending_page(7) == 40
+    assert journal_entries(journal) == [{'op': 'progress', 'user_book_id': 7, 'current_page': 40}]
+    buffer.close()
+
+
+def test_failed_flush_keeps_writes_and_merges_newer_ones(journal):
+    db = FakeDatabase(ok=False)
+    buffer = open_buffer(db, journal)
+    buffer.queue_progress(7, 10)
+    buffer.queue_streak(1, '2026-10-17', 1)
+
+    def queue_during_write():
+        db.during_write = None
+        buffer.queue_progress(7, 12)
+        buffer.queue_progress(8, 3)
+        buffer.queue_streak(1, '2026-10-17', 1)
+
+    db.during_write = queue_during_write
+    assert not buffer.flush()
+
+    # The page queued during the failed write is newer and wins; pages read add up
+    assert buffer.pending_page(7) == 12
+    assert buffer.pending_page(8) == 3
+    assert buffer.stats()['failed_flushes'] == 1
+
+    # The journal still holds everything, so a crash now loses nothing
+    replayed = open_buffer(FakeDatabase(ok=False), journal)
+    assert replayed.pending_page(7) == 12
+    assert replayed.pending_page(8) == 3
+    replayed.close()
+
+    db.ok = True
+    assert buffer.flush()
+    assert db.batches[-1] == ([(3, 8), (12, 7)], [(1, '2026-10-17', 2)])
+    assert buffer.stats()['pending'] == 0
+    buffer.close()
+
+
+def test_max_pending_triggers_a_flush(journal):
+    db = FakeDatabase()
+    buffer = open_buffer(db, journal, max_pending=3)
+    buffer.queue_progress(1, 10)
+    buffer.queue_progress(2, 20)
+    assert not db.written.wait(0.2)
+
+    buffer.queue_progress(3, 30)
+    assert db.written.wait(5)
+    assert db.batches == [([(10, 1), (20, 2), (30, 3)], [])]
+    buffer.close()
@@ -0,0 +1,105 @@
+"""
+Main Thread Dispatcher
+Lets worker threads and an asyncio loop hand results back to the Tk event loop safely.
+"""
+
+import asyncio
+import queue
+import threading
+
+class MainThreadDispatcher:
+    """Runs callbacks posted from any thread on the Tk main thread via after()"""
+
+    def __init__(self, root, interval=25):
+        """
+        Start polling for posted callbacks
+
+        Args:
+            root: Tk root window
+            interval: Milliseconds between queue checks
+        """
+        self.root = root
+        self.interval = interval
+        self.queue = queue.SimpleQueue()
+        self.running = True
+        self.root.after(self.interval, self._drain)
+
+    def post(self, callback, *args):
+        """Schedule callback(*args) on the main thread (safe to call from any thread)"""
+        self.queue.put((callback, args))
+
+    def stop(self):
+        """Stop polling"""
+        self.running = False
+
+    def _drain(self):
+        """Run everything that has been posted since the last check"""
+        while True:
+            try:
+                callback, args = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in main thread callback: {e}")
+
+        if self.running:
+            self.root.after(self.interval, self._drain)
+
+
+class AsyncLoopThread:
+    """Runs an asyncio event loop on its own thread so Tk code can submit coroutines"""
+
+    def __init__(self, dispatcher):
+        """
+        Start the loop thread
+
+        Args:
+            dispatcher: MainThreadDispatcher used to deliver results to Tk
+        """
+        self.dispatcher = dispatcher
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name="asyncio-loop", daemon=True)
+        self.thread.start()
+
+    def submit(self, coroutine, callback=None, errback=None):
+        """
+        Schedule a coroutine on the loop (safe to call from any thread)
+
+        Args:
+            coroutine: Coroutine object to run
+            callback: Called on the Tk main thread with the result
+            errback: Called on the Tk main thread with the exception, if any
+
+        Returns:
+            concurrent.futures.Future for the coroutine's result
+        """
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+        future.add_done_callback(lambda f: self._finished(f, callback, errback))
+        return future
+
+    def stop(self, timeout=5):
+        """Stop the loop and wait for its thread to exit"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+
+    def _run(self):
+        """Thread body"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        self.loop.close()
+
+    def _finished(self, future, callback, errback):
+        """Forward a coroutine's outcome to the main thread"""
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            if errback:
+                self.dispatcher.post(errback, error)
+            else:
+                print(f"Error in background task: {error}")
+        elif callback:
+            self.dispatcher.post(callback, future.result())
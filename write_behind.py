@@ -0,0 +1,262 @@
+"""
+Write-Behind Progress Buffer
+Collects reading progress and streak updates in memory (backed by an on-disk
+journal) and writes them to MySQL in one transaction every few seconds.
+
+Durability:
+    - A queued write is appended to the journal and fsync'd by a background
+      thread right after queue_progress()/queue_streak() returns, so the Tk
+      thread never waits on the disk. Writes queued in the last moments before
+      the process dies (before that fsync) can be lost; sync() waits for it.
+    - It reaches MySQL on the next flush: every flush_interval seconds, as soon
+      as max_pending entries are waiting, and on close().
+    - On startup the journal is replayed into the buffer and flushed, so writes
+      queued before a crash or a kill are not lost. The journal is then rewritten
+      from what was replayed, dropping a line torn by the crash.
+    - A failed flush keeps its writes (in memory and in the journal) and is
+      retried on the next tick.
+    - Replay is at-least-once: progress is an absolute page and safe to repeat,
+      but if the process dies between a flush's commit and the journal being
+      rewritten, that flush's pages_read increments are added a second time.
+"""
+
+import json
+import os
+import threading
+from search_cache import CACHE_DIR
+
+class WriteBehindBuffer:
+    """Coalesces progress and streak writes and flushes them on a background thread"""
+
+    def __init__(self, db, journal_path=None, flush_interval=2.0, max_pending=50):
+        """
+        Replay the journal and start the flush thread
+
+        Args:
+            db: Database instance (see Database.write_progress_batch)
+            journal_path: Append-only JSON Lines file (defaults to CACHE_DIR/progress_journal.jsonl)
+            flush_interval: Seconds between flushes
+            max_pending: Number of waiting entries that triggers an immediate flush
+        """
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        if journal_path is None:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            journal_path = os.path.join(CACHE_DIR, "progress_journal.jsonl")
+        self.journal_path = journal_path
+
+        self.lock = threading.Lock()          # Guards the pending writes
+        self.journal_lock = threading.Lock()  # Held while the journal file is written or replaced
+        self.flush_lock = threading.Lock()    # One flush at a time
+        self.progress = {}  # user_book_id -> current_page (the newest page wins)
+        self.streaks = {}   # (user_id, 'YYYY-MM-DD') -> pages_read to add
+        self.flushing = ({}, {})  # The progress and streaks of the flush in progress
+        self.unjournaled = []     # Entries queued but not appended to the journal yet
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.failed_flushes = 0
+
+        self.journal = None
+        replayed = self._replay()
+        # Start a clean file, so new entries never continue a torn last line
+        self._rewrite_journal()
+
+        self.wake = threading.Event()
+        self.journal_wake = threading.Event()
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self.journal_thread = threading.Thread(target=self._run_journal, name="progress-journal", daemon=True)
+        self.thread.start()
+        self.journal_thread.start()
+        if replayed:
+            print(f"Replaying {replayed} reading progress updates from the journal")
+            self.wake.set()
+
+    def queue_progress(self, user_book_id, current_page):
+        """Record the page a user has reached (replaces any unflushed page for that book)"""
+        self._queue({'op': 'progress', 'user_book_id': user_book_id, 'current_page': current_page})
+
+    def queue_streak(self, user_id, date, pages_read=0):
+        """
+        Record a reading day (unflushed pages for the same day are added together)
+
+        Args:
+            user_id: Reader
+            date: 'YYYY-MM-DD' string or date
+            pages_read: Pages to add to the day's total
+        """
+        date_str = date if isinstance(date, str) else date.strftime('%Y-%m-%d')
+        self._queue({'op': 'streak', 'user_id': user_id, 'date': date_str, 'pages_read': pages_read})
+
+    def pending_page(self, user_book_id, default=None):
+        """Unflushed page for a shelf entry, so a reload doesn't show an older one"""
+        with self.lock:
+            page = self.flushing[0].get(user_book_id, default)
+            return self.progress.get(user_book_id, page)
+
+    def pending_dates(self, user_id):
+        """Unflushed reading days of a user as 'YYYY-MM-DD' strings"""
+        with self.lock:
+            return {date_str for streaks in (self.flushing[1], self.streaks)
+                    for streak_user, date_str in streaks if streak_user == user_id}
+
+    def flush(self):
+        """
+        Write everything queued so far in one transaction
+
+        Returns:
+            True if the buffer was empty or the write committed, False if it is kept for a retry
+        """
+        with self.flush_lock:
+            with self.lock:
+                progress, self.progress = self.progress, {}
+                streaks, self.streaks = self.streaks, {}
+                self.flushing = (progress, streaks)
+            if not progress and not streaks:
+                return True
+
+            ok = self.db.write_progress_batch(
+                [(page, user_book_id) for user_book_id, page in progress.items()],
+                [(user_id, date_str, pages) for (user_id, date_str), pages in streaks.items()]
+            )
+
+            with self.lock:
+                self.flushing = ({}, {})
+                if ok:
+                    self.flushes += 1
+                    self.rows_written += len(progress) + len(streaks)
+                else:
+                    self.failed_flushes += 1
+                    # Writes queued during the flush are newer than the ones being put back
+                    self.progress = {**progress, **self.progress}
+                    for key, pages in streaks.items():
+                        self.streaks[key] = pages + self.streaks.get(key, 0)
+            self._rewrite_journal()
+            return ok
+
+    def sync(self):
+        """Journal everything queued so far before returning (blocks on the disk)"""
+        self._write_journal()
+
+    def stats(self):
+        """Return flush counters and the number of waiting entries"""
+        with self.lock:
+            return {
+                'pending': len(self.progress) + len(self.streaks),
+                'flushes': self.flushes,
+                'rows_written': self.rows_written,
+                'failed_flushes': self.failed_flushes
+            }
+
+    def close(self):
+        """Stop the threads and make a last flush (whatever fails stays journaled)"""
+        self.stopped = True
+        self.wake.set()
+        self.journal_wake.set()
+        self.thread.join(timeout=self.flush_interval + 10)
+        self.journal_thread.join(timeout=10)
+        self.sync()
+        self.flush()
+        with self.journal_lock:
+            self.journal.close()
+
+    def _queue(self, entry):
+        """Add an entry to the buffer and hand it to the journal thread"""
+        with self.lock:
+            self._apply(entry)
+            self.unjournaled.append(entry)
+            full = len(self.progress) + len(self.streaks) >= self.max_pending
+        self.journal_wake.set()
+        if full:
+            self.wake.set()
+
+    def _write_journal(self):
+        """Append the entries queued since the last call to the journal and fsync it"""
+        with self.journal_lock:
+            with self.lock:
+                entries, self.unjournaled = self.unjournaled, []
+            if not entries:
+                return
+            try:
+                self.journal.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+                self.journal.flush()
+                os.fsync(self.journal.fileno())
+            except (OSError, ValueError) as e:
+                print(f"Error writing progress journal: {e}")
+
+    def _apply(self, entry):
+        """Merge one journal entry into the pending writes (lock held)"""
+        if entry['op'] == 'progress':
+            self.progress[entry['user_book_id']] = entry['current_page']
+        else:
+            key = (entry['user_id'], entry['date'])
+            self.streaks[key] = self.streaks.get(key, 0) + entry['pages_read']
+
+    def _replay(self):
+        """Load the entries a previous run didn't flush; returns how many were read"""
+        count = 0
+        try:
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line of a write the crash interrupted
+                    self._apply(entry)
+                    count += 1
+        except FileNotFoundError:
+            pass
+        return count
+
+    def _rewrite_journal(self):
+        """Replace the journal with just the pending writes"""
+        with self.journal_lock:
+            # Entries queued after this snapshot stay unjournaled and are appended later
+            with self.lock:
+                progress = dict(self.progress)
+                streaks = dict(self.streaks)
+                self.unjournaled = []
+            self._replace_journal(progress, streaks)
+
+    def _replace_journal(self, progress, streaks):
+        """Atomically swap in a journal holding progress and streaks (journal_lock held)"""
+        temp_path = self.journal_path + ".tmp"
+        if self.journal is not None:
+            self.journal.close()
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for user_book_id, page in progress.items():
+                    f.write(json.dumps({'op': 'progress', 'user_book_id': user_book_id,
+                                        'current_page': page}) + '\n')
+                for (user_id, date_str), pages in streaks.items():
+                    f.write(json.dumps({'op': 'streak', 'user_id': user_id,
+                                        'date': date_str, 'pages_read': pages}) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.journal_path)
+        except OSError as e:
+            # The old journal still holds every pending write (plus some flushed ones)
+            print(f"Error rewriting progress journal: {e}")
+        self.journal = open(self.journal_path, 'a', encoding='utf-8')
+
+    def _run(self):
+        """Flush every flush_interval seconds, or sooner when woken"""
+        while not self.stopped:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            if self.stopped:
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing reading progress: {e}")
+
+    def _run_journal(self):
+        """Journal queued entries as soon as they arrive, off the Tk thread"""
+        while not self.stopped:
+            self.journal_wake.wait()
+            self.journal_wake.clear()
+            self._write_journal()